@@ -16,3 +16,24 @@ DEVICES: dict[str, dict[str, Any]] = {
     },
     "pseudo_rng": {"name": "Pseudo RNG", "module": pseudo_rng, "type": "Software"},
 }
+
+# Short device codes used in capture filenames (see filenames.format_capture_name)
+DEVICE_CODES: dict[str, str] = {
+    "bitbabbler_rng": "bitb",
+    "truerng": "trng",
+    "intel_seed": "intel",
+    "pseudo_rng": "pseudo",
+}
+
+# USB devices whose port may still be held by the OS right after a close;
+# only these retry the availability check on start
+USB_DEVICES = frozenset({"bitbabbler_rng", "truerng"})
+
+# Number of most recent samples kept for the live Z-Score plot (ring buffer)
+PLOT_MAX_POINTS = 1000
+
+# Minimum seconds between StatsPanel/plot refreshes during collection (~10 Hz)
+UI_UPDATE_INTERVAL = 0.1
+
+# Maximum points drawn per live plot refresh; older history is stride-sampled
+PLOT_RENDER_POINTS = 250
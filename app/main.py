@@ -1,10 +1,14 @@
 import asyncio
+import math
 import os
+import time
 import traceback
+from collections import deque
+from datetime import datetime
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+from scipy.special import erfc
 from textual.app import App, ComposeResult
 from textual.containers import (
     HorizontalScroll,
@@ -23,17 +27,24 @@ from textual.widgets import (
 )
 
 # Import RNG device modules for close() operations
-from lib.rng_devices import bitbabbler_rng, intel_seed
+from lib.rng_devices import bitbabbler_rng, intel_seed, shutdown_all, truerng
 
 # Import services
 from lib.services import filenames
+from lib.services.bitcount import popcount_bytes
 from lib.services.storage import (
+    CountWriter,
     read_csv_counts,
-    write_csv_count,
     write_enhanced_excel,
 )
 
-from .config import DEVICES
+from .config import (
+    DEVICE_CODES,
+    DEVICES,
+    PLOT_MAX_POINTS,
+    UI_UPDATE_INTERVAL,
+    USB_DEVICES,
+)
 from .panels import (
     AnalysisPanel,
     ConfigPanel,
@@ -66,19 +77,28 @@ class RNGCollectorApp(App):
         self.is_collecting = False
         self.is_paused = False
         self.collection_task = None
+        # Set to end the collection loop; the single shutdown path is action_stop
+        self._stop_evt = asyncio.Event()
         self.sample_count = 0
         self.total_ones = 0
+        self.total_bits = 0
         self.start_time = None
-        self._loop: asyncio.AbstractEventLoop | None = None
+        # Scratch buffer for per-byte popcounts, reused every sample
+        self._popcount_buf = np.empty(self.sample_bytes, dtype=np.uint8)
+        # CSV rows are queued to a writer task that appends them in batches
+        self._write_q: asyncio.Queue[tuple[datetime, int] | None] | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._csv_flush_every = 32
+        self._csv_flush_interval = 5.0
         self.pause_button_label = "⏸ Pause"
 
         # Analysis state
         self.analysis_df = None
         self.selected_file_path = None
 
-        # Live plot data
-        self.x_data: list[int] = []
-        self.y_data: list[float] = []
+        # Live plot data (bounded to the most recent PLOT_MAX_POINTS samples)
+        self.x_data: deque[int] = deque(maxlen=PLOT_MAX_POINTS)
+        self.y_data: deque[float] = deque(maxlen=PLOT_MAX_POINTS)
         self.cumulative_ones: int = 0
 
     def compose(self) -> ComposeResult:
@@ -105,6 +125,29 @@ class RNGCollectorApp(App):
         self.title = "RNG Data Collector TUI"
         self.sub_title = "Hardware & Software RNG Data Collection"
 
+        # Cache widgets touched on every state change / collection tick
+        self._start_btn = self.query_one("#start_btn", Button)
+        self._pause_btn = self.query_one("#pause_btn", Button)
+        self._stop_btn = self.query_one("#stop_btn", Button)
+        self._stats_panel = self.query_one(StatsPanel)
+        self._plot_panel = self.query_one(LivePlotPanel)
+        # Cache the run configuration inputs read by action_start
+        config = self.query_one(ConfigPanel)
+        self._device_select = config.query_one("#device_select", Select)
+        self._bits_input = config.query_one("#bits_input", Input)
+        self._freq_input = config.query_one("#freq_input", Input)
+        self._duration_input = config.query_one("#duration_input", Input)
+        self._folds_select = config.query_one("#folds_select", Select)
+
+    async def action_quit(self) -> None:
+        """Stop any running collection, flushing queued CSV rows, then exit."""
+        await self.action_stop()
+        await super().action_quit()
+
+    def on_unmount(self):
+        """Release the RNG backends' async worker threads on exit."""
+        shutdown_all()
+
     def on_directory_tree_file_selected(
         self, event: DirectoryTree.FileSelected
     ) -> None:
@@ -163,11 +206,10 @@ class RNGCollectorApp(App):
             return
 
         # Get configuration
-        config = self.query_one(ConfigPanel)
-        device_key_raw = config.query_one("#device_select", Select).value
-        bits_str = config.query_one("#bits_input", Input).value
-        freq_str = config.query_one("#freq_input", Input).value
-        duration_str = config.query_one("#duration_input", Input).value
+        device_key_raw = self._device_select.value
+        bits_str = self._bits_input.value
+        freq_str = self._freq_input.value
+        duration_str = self._duration_input.value
 
         # Validate device selection
         if device_key_raw is None or device_key_raw == "":
@@ -206,11 +248,12 @@ class RNGCollectorApp(App):
                 )
                 return
             self.device_module = device_info["module"]
+            device_name = device_info["name"]
 
             # Get folds for BitBabbler
             if device_key == "bitbabbler_rng":
                 folds_val: int | None = None
-                folds_raw = config.query_one("#folds_select", Select).value
+                folds_raw = self._folds_select.value
                 if folds_raw is not None:
                     try:
                         folds_val = int(str(folds_raw))
@@ -230,15 +273,16 @@ class RNGCollectorApp(App):
                         intel_seed.close()
                         await asyncio.sleep(0.05)  # Reduced from 100ms
                     elif device_key == "truerng":
-                        # TrueRNG doesn't need explicit close, executor stays alive
-                        pass
+                        truerng.close()
                 except Exception:
                     pass  # Ignore errors - device might not have been opened
 
-            # Check device availability with retry logic
+            # Check device availability; USB devices retry while the OS
+            # releases the port, CPU and software sources answer at once
             device_available = False
             error_msg = ""
-            for attempt in range(3):
+            attempts = 3 if device_key in USB_DEVICES else 1
+            for attempt in range(attempts):
                 try:
                     if self.device_module.is_device_available():
                         device_available = True
@@ -246,7 +290,7 @@ class RNGCollectorApp(App):
                 except Exception as e:
                     error_msg = str(e)
 
-                if attempt < 2:  # Don't sleep on last attempt
+                if attempt < attempts - 1:  # Don't sleep on last attempt
                     await asyncio.sleep(
                         0.2
                     )  # Reduced from 500ms for better responsiveness
@@ -254,33 +298,26 @@ class RNGCollectorApp(App):
             if not device_available:
                 if device_key == "bitbabbler_rng":
                     self.notify(
-                        f"Device {DEVICES[device_key]['name']} not available. "
+                        f"Device {device_name} not available. "
                         "The USB device may be busy. Try waiting a few seconds or reconnecting.",
                         severity="error",
                         timeout=1.0,
                     )
                 elif error_msg:
                     self.notify(
-                        f"Device {DEVICES[device_key]['name']} not available: {error_msg}",
+                        f"Device {device_name} not available: {error_msg}",
                         severity="error",
                         timeout=1.0,
                     )
                 else:
                     self.notify(
-                        f"Device {DEVICES[device_key]['name']} not available",
+                        f"Device {device_name} not available",
                         severity="error",
                         timeout=1.0,
                     )
                 return
 
-            # Map device key to device code
-            device_code_map = {
-                "bitbabbler_rng": "bitb",
-                "truerng": "trng",
-                "intel_seed": "intel",
-                "pseudo_rng": "pseudo",
-            }
-            device_code = device_code_map.get(device_key, device_key)
+            device_code = DEVICE_CODES.get(device_key, device_key)
 
             # Generate filename using new convention
             folds_param: int | None = (
@@ -295,26 +332,30 @@ class RNGCollectorApp(App):
             self.output_file = f"data/raw/{filename_stem}.csv"
 
             # Reset state
+            self._stop_evt.clear()
             self.is_collecting = True
             self.is_paused = False
             self.sample_count = 0
             self.total_ones = 0
+            self.total_bits = 0
             self.cumulative_ones = 0
+            self._popcount_buf = np.empty(self.sample_bytes, dtype=np.uint8)
             self.x_data.clear()
             self.y_data.clear()
-            self._loop = asyncio.get_running_loop()
-            self.start_time = self._loop.time()
+            self.start_time = time.monotonic()
 
             # Update UI
             self._update_buttons()
-            stats = self.query_one(StatsPanel)
-            stats.is_collecting = True
+            self._stats_panel.is_collecting = True
 
             # Clear plot for new collection
-            plot_panel = self.query_one(LivePlotPanel)
-            plot_panel.clear_plot()
+            self._plot_panel.clear_plot()
 
-            # Start collection
+            # Start the CSV writer, then collection
+            self._write_q = asyncio.Queue(maxsize=1024)
+            self._writer_task = asyncio.create_task(
+                self._csv_writer_loop(f"data/raw/{filename_stem}")
+            )
             self.collection_task = asyncio.create_task(self._collection_loop())
 
             self.notify(
@@ -341,19 +382,21 @@ class RNGCollectorApp(App):
         self._update_buttons()
 
     async def action_stop(self):
-        """Stop data collection and properly release device resources."""
+        """Stop data collection and properly release device resources.
+
+        Idempotent: signals the collection loop through the stop event, waits
+        for it to finish its current sample, then closes the device once.
+        """
         if not self.is_collecting:
             return
 
         self.is_collecting = False
         self.is_paused = False
+        self._stop_evt.set()
 
-        if self.collection_task:
-            self.collection_task.cancel()
-            try:
-                await self.collection_task
-            except asyncio.CancelledError:
-                pass
+        task, self.collection_task = self.collection_task, None
+        if task is not None:
+            await task
 
         # Close device resources for hardware RNGs
         if self.device_key and self.device_module:
@@ -374,21 +417,28 @@ class RNGCollectorApp(App):
                     intel_seed.close()
                     await asyncio.sleep(0.05)  # Reduced from 100ms
                 elif self.device_key == "truerng":
-                    # TrueRNG closes serial port per operation, no persistent resources
-                    pass
+                    # Close the cached TrueRNG serial port
+                    truerng.close()
                 # PseudoRNG has no resources to release
             except Exception as e:
                 # Log but don't fail - device might already be closed
                 print(f"Warning: Error closing device: {e}")
 
+        # Let the CSV writer drain the queue and write out pending rows
+        if self._writer_task is not None and self._write_q is not None:
+            if not self._writer_task.done():
+                await self._write_q.put(None)
+            await self._writer_task
+        self._writer_task = None
+        self._write_q = None
+
         # Reset device references
         self.device_module = None
         self.device_key = None
 
         # Update UI
         self._update_buttons()
-        stats = self.query_one(StatsPanel)
-        stats.is_collecting = False
+        self._stats_panel.is_collecting = False
 
         self.notify(
             f"Collection stopped. Data saved to {self.output_file}",
@@ -396,6 +446,59 @@ class RNGCollectorApp(App):
             timeout=1.0,
         )
 
+    async def _csv_writer_loop(self, file_stem: str) -> None:
+        """Drain queued sample counts and append them to the CSV in batches.
+
+        Rows are grouped until `_csv_flush_every` are pending or
+        `_csv_flush_interval` seconds have passed, then written in a worker
+        thread so disk I/O never blocks the event loop. The CSV stays open
+        for the whole run. A `None` item flushes what is left and ends the
+        loop. If a write fails the run is stopped
+        and the loop exits without writing further rows.
+        """
+        queue = self._write_q
+        if queue is None:
+            return
+        loop = asyncio.get_running_loop()
+        writer = CountWriter(file_stem)
+        done = False
+
+        try:
+            while not done:
+                item = await queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = loop.time() + self._csv_flush_interval
+                while len(batch) < self._csv_flush_every:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                    if item is None:
+                        done = True
+                        break
+                    batch.append(item)
+
+                try:
+                    await asyncio.to_thread(writer.write_rows, batch)
+                except Exception as e:
+                    # A failed write ends the run, as a failed sample read does
+                    self.notify(
+                        f"Error writing CSV: {e}", severity="error", timeout=1.0
+                    )
+                    self._stop_evt.set()
+                    # Unblock any producer waiting on a full queue
+                    while not queue.empty():
+                        queue.get_nowait()
+                    self.call_later(self.action_stop)
+                    return
+        finally:
+            writer.close()
+
     def validate_selected_file(self) -> bool:
         """Validate selected file format and existence."""
         panel = self.query_one(AnalysisPanel)
@@ -415,15 +518,17 @@ class RNGCollectorApp(App):
 
         # Check if file is readable and has valid format
         try:
-            with open(self.selected_file_path) as f:
-                first_line = f.readline().strip()
-                # Expect format: YYYYMMDDTHHMMSS,count
-                parts = first_line.split(",")
-                if len(parts) != 2:
-                    msg.update("❌ Invalid CSV format (expected: time,count)")
-                    return False
-                # Try parsing count as int
-                int(parts[1])
+            # Peek at the first row only; rows are short (YYYYMMDDTHHMMSS,count)
+            with open(self.selected_file_path, "rb") as f:
+                head = f.read(256)
+            nl = head.find(b"\n")
+            first_line = (head if nl < 0 else head[:nl]).strip()
+            comma = first_line.find(b",")
+            if comma < 0 or first_line.find(b",", comma + 1) >= 0:
+                msg.update("❌ Invalid CSV format (expected: time,count)")
+                return False
+            # Try parsing count as int
+            int(first_line[comma + 1 :])
         except Exception as e:
             msg.update(f"❌ File validation failed: {e}")
             return False
@@ -448,11 +553,10 @@ class RNGCollectorApp(App):
             # Get parameters
             bits = int(panel.query_one("#analysis_bits_input", Input).value)
 
-            # Read CSV
-            self.analysis_df = read_csv_counts(file_path)
-
-            # Calculate Z-scores with p-values
-            self.analysis_df = self.add_zscore_with_pvalues(self.analysis_df, bits)
+            # Read CSV and calculate Z-scores with p-values in a worker thread
+            self.analysis_df = await asyncio.to_thread(
+                self._run_analysis, file_path, bits
+            )
 
             # Update statistics display
             self.update_statistics_display(self.analysis_df, bits)
@@ -466,6 +570,11 @@ class RNGCollectorApp(App):
         except Exception as e:
             self.notify(f"Analysis failed: {e}", severity="error", timeout=1.0)
 
+    def _run_analysis(self, file_path: str, bits: int) -> pd.DataFrame:
+        """Read a capture CSV and add Z-score/p-value columns (thread-safe)."""
+        df = read_csv_counts(file_path)
+        return self.add_zscore_with_pvalues(df, bits)
+
     def add_zscore_with_pvalues(
         self, df: pd.DataFrame, block_bits: int
     ) -> pd.DataFrame:
@@ -473,22 +582,28 @@ class RNGCollectorApp(App):
         expected_mean = 0.5 * block_bits
         expected_std_dev = np.sqrt(block_bits * 0.25)
 
-        # Calculate sample count for each row
-        df["sample_count"] = range(1, len(df) + 1)
-
-        # Cumulative mean
-        df["cumulative_mean"] = df["ones"].expanding().mean()
+        # Sample count for each row and cumulative mean in one cumsum pass
+        ones = df["ones"].to_numpy(dtype=np.float64)
+        counts = np.arange(1, ones.size + 1, dtype=np.float64)
+        cum_mean = ones.cumsum() / counts
 
         # Z-score (standard error decreases with sqrt(n))
-        df["z_test"] = (df["cumulative_mean"] - expected_mean) / (
-            expected_std_dev / np.sqrt(df["sample_count"])
+        z = cum_mean - expected_mean
+        z *= np.sqrt(counts)
+        z *= 1.0 / expected_std_dev
+
+        # Two-tailed p-value: 2 * (1 - cdf(|z|)) == erfc(|z| / sqrt(2)),
+        # without the cancellation of 1 - cdf in the tails
+        p_value = erfc(np.abs(z) / np.sqrt(2.0))
+
+        # Add all derived columns in a single block insertion
+        return df.assign(
+            sample_count=counts.astype(np.int64),
+            cumulative_mean=cum_mean,
+            z_test=z,
+            p_value=p_value,
         )
 
-        # Two-tailed p-value
-        df["p_value"] = 2 * (1 - norm.cdf(np.abs(df["z_test"])))
-
-        return df
-
     def update_statistics_display(self, df: pd.DataFrame, bits: int):
         """Calculate and display comprehensive statistics."""
         stats = self.query_one("#stats_display", Static)
@@ -555,9 +670,13 @@ class RNGCollectorApp(App):
                 timeout=1.0,
             )
 
-            # Use the function from storage module
-            excel_path = write_enhanced_excel(
-                self.analysis_df, self.selected_file_path, bits, interval
+            # Use the function from storage module, off the event loop
+            excel_path = await asyncio.to_thread(
+                write_enhanced_excel,
+                self.analysis_df,
+                self.selected_file_path,
+                bits,
+                interval,
             )
 
             self.notify(
@@ -577,9 +696,9 @@ class RNGCollectorApp(App):
 
     def _update_buttons(self):
         """Update button states."""
-        start_btn = self.query_one("#start_btn", Button)
-        pause_btn = self.query_one("#pause_btn", Button)
-        stop_btn = self.query_one("#stop_btn", Button)
+        start_btn = self._start_btn
+        pause_btn = self._pause_btn
+        stop_btn = self._stop_btn
 
         if not self.is_collecting:
             start_btn.disabled = False
@@ -612,19 +731,39 @@ class RNGCollectorApp(App):
             self.notify("Output file not set", severity="error", timeout=1.0)
             return
 
-        stats_panel = self.query_one(StatsPanel)
-        plot_panel = self.query_one(LivePlotPanel)
+        stats_panel = self._stats_panel
+        plot_panel = self._plot_panel
 
         # Cache local references for performance and type safety
+        write_q = self._write_q
+        if write_q is None:
+            self.notify("CSV writer not started", severity="error", timeout=1.0)
+            return
         device_module = self.device_module
-        loop: asyncio.AbstractEventLoop = self._loop  # type: ignore[assignment]
+        monotonic = time.monotonic
+        popcount_buf = self._popcount_buf
         start_time = self.start_time
-        output_file = self.output_file
+        stop_evt = self._stop_evt
+        duration = self.duration  # fixed for the run; 0 means no time limit
+
+        # Per-run constants of the cumulative z-score
+        block_bits = self.sample_bytes * 8
+        expected_mean = 0.5 * block_bits
+        expected_std_dev = math.sqrt(block_bits * 0.25)
+
+        # Last values pushed to the UI; only re-render when they change
+        last_elapsed_s = -1
+        last_progress = -1
+        last_ui_push = float("-inf")
+        # Time the next sample is due; advanced by the period every tick
+        next_due = monotonic()
 
         try:
-            while self.is_collecting:
+            while not stop_evt.is_set():
                 if self.is_paused:
                     await asyncio.sleep(0.1)
+                    # Resume on a fresh schedule rather than catching up
+                    next_due = monotonic()
                     continue
 
                 # Collect sample
@@ -636,73 +775,96 @@ class RNGCollectorApp(App):
                     data = await device_module.get_bytes_async(self.sample_bytes)
 
                 # Calculate statistics
-                ones = int.from_bytes(data, "big").bit_count()
-                ratio = (ones / (len(data) * 8)) * 100
+                ones = popcount_bytes(data, popcount_buf)
+                ratio = ones * 100.0 / block_bits
 
                 # Update counters
                 self.sample_count += 1
                 self.total_ones += ones
+                self.total_bits += block_bits
                 self.cumulative_ones += ones
 
                 # Calculate cumulative Z-score
                 sample_count = self.sample_count
-                block_bits = self.sample_bytes * 8
-                expected_mean = 0.5 * block_bits
-                expected_std_dev = np.sqrt(block_bits * 0.25)
                 cumulative_mean = self.cumulative_ones / sample_count
                 z_score = (cumulative_mean - expected_mean) / (
-                    expected_std_dev / np.sqrt(sample_count)
+                    expected_std_dev / math.sqrt(sample_count)
                 )
 
                 # Update plot data
                 self.x_data.append(sample_count)
                 self.y_data.append(z_score)
 
-                # Calculate running average
-                running_avg = (
-                    self.total_ones / (self.sample_count * len(data) * 8)
-                ) * 100
+                # Calculate running average over all bits collected so far
+                running_avg = self.total_ones * 100.0 / self.total_bits
 
                 # Calculate elapsed time
-                elapsed = loop.time() - start_time
-                hours = int(elapsed // 3600)
-                minutes = int((elapsed % 3600) // 60)
-                seconds = int(elapsed % 60)
-                elapsed_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
-                # Update UI (reactive updates)
-                stats_panel.current_ratio = ratio
-                stats_panel.running_avg = running_avg
-                stats_panel.total_samples = self.sample_count
-                stats_panel.elapsed_time = elapsed_str
-
-                # Update progress bar (if duration > 0)
-                if self.duration > 0:
-                    progress = int((elapsed / self.duration) * 100)
-                    stats_panel.update_progress(progress, 100)
-
-                # Update plot and table
-                plot_panel.update_plot(
-                    self.x_data,
-                    self.y_data,
-                    ratio,
-                    z_score,
-                )
-
-                # Write to CSV using storage service
-                file_stem = os.path.splitext(output_file)[0]
-                write_csv_count(ones, file_stem)
-
-                # Check if duration exceeded
-                if self.duration > 0 and elapsed >= self.duration:
-                    await self.action_stop()
+                elapsed = monotonic() - start_time
+
+                duration_reached = duration > 0 and elapsed >= duration
+
+                # Throttle UI pushes to UI_UPDATE_INTERVAL; CSV rows are not
+                # throttled. Always push the final sample of a timed run.
+                if elapsed - last_ui_push >= UI_UPDATE_INTERVAL or duration_reached:
+                    last_ui_push = elapsed
+
+                    # Suspend repaints so the stats and plot land in one frame
+                    with self.batch_update():
+                        # Update UI (reactive updates)
+                        stats_panel.current_ratio = ratio
+                        stats_panel.running_avg = running_avg
+                        stats_panel.total_samples = self.sample_count
+
+                        # Elapsed label only changes once per second
+                        elapsed_s = int(elapsed)
+                        if elapsed_s != last_elapsed_s:
+                            last_elapsed_s = elapsed_s
+                            hours, rem = divmod(elapsed_s, 3600)
+                            minutes, seconds = divmod(rem, 60)
+                            stats_panel.elapsed_time = (
+                                f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+                            )
+
+                        # Update progress bar (if duration > 0) when the percent moves
+                        if duration > 0:
+                            progress = int((elapsed / duration) * 100)
+                            if progress != last_progress:
+                                last_progress = progress
+                                stats_panel.update_progress(progress, 100)
+
+                        # Update plot
+                        plot_panel.update_plot(
+                            self.x_data,
+                            self.y_data,
+                            ratio,
+                            z_score,
+                        )
+
+                # Hand the CSV row to the writer task (waits if the queue is full)
+                await write_q.put((datetime.now(), ones))
+
+                # Check if duration exceeded; stop runs outside this task
+                if duration_reached:
+                    self.call_later(self.action_stop)
                     break
 
-                # Wait for next sample
-                await asyncio.sleep(self.frequency)
+                # Wait until the next sample is due, waking early if a stop is
+                # requested. Scheduling by deadline keeps the sample time out
+                # of the period; a sample that overran restarts the schedule
+                # from now instead of bursting to catch up.
+                next_due += self.frequency
+                delay = next_due - monotonic()
+                if delay <= 0:
+                    next_due -= delay
+                    await asyncio.sleep(0)
+                    continue
+                try:
+                    await asyncio.wait_for(stop_evt.wait(), delay)
+                except TimeoutError:
+                    pass
 
         except asyncio.CancelledError:
             pass
         except Exception as e:
             self.notify(f"Error during collection: {e}", severity="error", timeout=1.0)
-            await self.action_stop()
+            self.call_later(self.action_stop)
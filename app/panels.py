@@ -1,3 +1,6 @@
+from collections.abc import Sequence
+from itertools import islice
+
 from textual.app import ComposeResult
 from textual.containers import (
     Horizontal,
@@ -17,7 +20,13 @@ from textual.widgets import (
 )
 from textual_plot import HiResMode, PlotWidget
 
-from .config import DEVICES
+from .config import DEVICES, PLOT_RENDER_POINTS
+
+# Select options are input-independent; build them once at import
+_DEVICE_OPTIONS = tuple(
+    (f"{info['name']} ({info['type']})", key) for key, info in DEVICES.items()
+)
+_FOLDS_OPTIONS = tuple((str(i), i) for i in range(5))
 
 
 class StatsPanel(VerticalGroup):
@@ -43,28 +52,51 @@ class StatsPanel(VerticalGroup):
             yield Button("⏸ Pause", id="pause_btn", variant="warning", disabled=True)
             yield Button("■ Stop", id="stop_btn", variant="error", disabled=True)
 
+    def on_mount(self) -> None:
+        # Cache labels updated on every stats push
+        self._current_ratio_label = self.query_one("#current_ratio", Label)
+        self._running_avg_label = self.query_one("#running_avg", Label)
+        self._total_samples_label = self.query_one("#total_samples", Label)
+        self._elapsed_time_label = self.query_one("#elapsed_time", Label)
+        self._progress_bar = self.query_one("#progress", ProgressBar)
+        self._ratio_color: str | None = None
+        # Last text shown per label; ratios often repeat at two decimals
+        self._ratio_text = ""
+        self._avg_text = ""
+
     def watch_current_ratio(self, ratio: float):
-        self.query_one("#current_ratio", Label).update(f"Current Ratio: {ratio:.2f}%")
+        label = self._current_ratio_label
+        text = f"Current Ratio: {ratio:.2f}%"
+        if text != self._ratio_text:
+            self._ratio_text = text
+            label.update(text)
         # Color code based on ratio quality
         if 45 <= ratio <= 55:
-            self.query_one("#current_ratio").styles.color = "#00ff00"  # Green
+            color = "#00ff00"  # Green
         elif 40 <= ratio <= 60:
-            self.query_one("#current_ratio").styles.color = "#ffff00"  # Yellow
+            color = "#ffff00"  # Yellow
         else:
-            self.query_one("#current_ratio").styles.color = "#ff0000"  # Red
+            color = "#ff0000"  # Red
+        # Only touch styles when the band changes; each write forces a restyle
+        if color != self._ratio_color:
+            self._ratio_color = color
+            label.styles.color = color
 
     def watch_running_avg(self, avg: float):
-        self.query_one("#running_avg", Label).update(f"Running Avg: {avg:.2f}%")
+        text = f"Running Avg: {avg:.2f}%"
+        if text != self._avg_text:
+            self._avg_text = text
+            self._running_avg_label.update(text)
 
     def watch_total_samples(self, count: int):
-        self.query_one("#total_samples", Label).update(f"Total Samples: {count}")
+        self._total_samples_label.update(f"Total Samples: {count}")
 
     def watch_elapsed_time(self, time_str: str):
-        self.query_one("#elapsed_time", Label).update(f"Elapsed: {time_str}")
+        self._elapsed_time_label.update(f"Elapsed: {time_str}")
 
     def update_progress(self, current: int, total: int):
         """Update progress bar for fixed duration."""
-        progress = self.query_one("#progress", ProgressBar)
+        progress = self._progress_bar
         if total > 0:
             progress.update(total=total, progress=current)
             progress.styles.visibility = "visible"
@@ -79,10 +111,7 @@ class ConfigPanel(VerticalGroup):
         yield Label("⚙️ Configuration", classes="title")
         yield Label("Device:")
         yield Select(
-            [
-                (f"{info['name']} ({info['type']})", key)
-                for key, info in DEVICES.items()
-            ],
+            _DEVICE_OPTIONS,
             id="device_select",
             value="pseudo_rng",
         )
@@ -100,7 +129,7 @@ class ConfigPanel(VerticalGroup):
             with VerticalGroup():
                 yield Label("Folds (BitBabbler only, 0=raw):")
                 yield Select(
-                    [(str(i), i) for i in range(5)],
+                    _FOLDS_OPTIONS,
                     id="folds_select",
                     value=0,
                     disabled=True,
@@ -120,20 +149,43 @@ class LivePlotPanel(VerticalGroup):
         yield Label("📈 Live Z-Score Graph", classes="title")
         yield PlotWidget(id="live_plot")
 
+    def on_mount(self) -> None:
+        self._plot = self.query_one("#live_plot", PlotWidget)
+        # x value of the newest sample drawn; x_data is a bounded ring buffer
+        # so its length stops changing once full
+        self._last_x: int | None = None
+
     def clear_plot(self) -> None:
         """Clear the plot for a new collection."""
-        plot = self.query_one("#live_plot", PlotWidget)
-        plot.clear()
+        self._plot.clear()
+        self._last_x = None
 
     def update_plot(
         self,
-        x_data: list[int],
-        y_data: list[float],
+        x_data: Sequence[int],
+        y_data: Sequence[float],
         current_ratio: float,
         current_z: float,
     ) -> None:
-        """Update the plot with new data."""
-        plot = self.query_one("#live_plot", PlotWidget)
+        """Update the plot with new data.
+
+        Skips the redraw when no sample arrived since the last call, and
+        stride-samples the series down to at most PLOT_RENDER_POINTS points,
+        always keeping the newest one.
+        """
+        n = len(x_data)
+        last_x = x_data[-1] if n else None
+        if last_x == self._last_x:
+            return
+        self._last_x = last_x
+
+        if n > PLOT_RENDER_POINTS:
+            stride = -(-n // PLOT_RENDER_POINTS)
+            start = (n - 1) % stride
+            x_data = list(islice(x_data, start, None, stride))
+            y_data = list(islice(y_data, start, None, stride))
+
+        plot = self._plot
         plot.clear()
 
         # Plot main Z-Score data
@@ -15,6 +15,8 @@ All modules expose a consistent API:
 - random_int(min_val: int = 0, max_val: Optional[int] = None) -> int
 - close() -> None
 
+shutdown_all() releases every backend's async executor thread at exit.
+
 Usage:
     from rng_devices import intel_seed, truerng, bitbabbler_rng, pseudo_rng
 
@@ -28,10 +30,12 @@ Usage:
 """
 
 from . import bitbabbler_rng, intel_seed, pseudo_rng, truerng
+from ._executor import shutdown_all
 
 __all__ = [
     "intel_seed",
     "truerng",
     "bitbabbler_rng",
     "pseudo_rng",
+    "shutdown_all",
 ]
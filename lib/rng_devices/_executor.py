@@ -0,0 +1,100 @@
+"""Executor registry shared by the RNG backends' async APIs.
+
+Each backend gets its own ThreadPoolExecutor, created on first use and
+re-created after a shutdown, so every backend shares one creation and
+shutdown path. Hardware backends get a single worker so calls into one
+device stay serialized; stateless backends may opt into a wider pool sized
+by the RNG_TUI_THREAD_POOL environment variable (default 1).
+"""
+
+import asyncio
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+# Worker count for backends that opt into concurrency (read at creation)
+POOL_SIZE_ENV = "RNG_TUI_THREAD_POOL"
+
+
+def _pool_size() -> int:
+    """Return the RNG_TUI_THREAD_POOL worker count; 1 if unset or invalid."""
+    try:
+        return max(1, int(os.environ.get(POOL_SIZE_ENV, "1")))
+    except ValueError:
+        return 1
+
+
+def get_executor(name: str, concurrent: bool = False) -> ThreadPoolExecutor:
+    """Return the executor for backend `name`, creating it if needed.
+
+    Args:
+        name: Backend name, e.g. "truerng"
+        concurrent: True if the backend is safe to call from several threads
+            at once; its executor then gets RNG_TUI_THREAD_POOL workers.
+            Hardware backends leave this False to stay serialized.
+
+    Returns:
+        A running executor for that backend
+    """
+    with _lock:
+        executor = _executors.get(name)
+        if executor is None or executor._shutdown:
+            executor = _executors[name] = ThreadPoolExecutor(
+                max_workers=_pool_size() if concurrent else 1,
+                thread_name_prefix=f"rng-{name}",
+            )
+        return executor
+
+
+async def run_cancellable(
+    executor: ThreadPoolExecutor,
+    on_cancel: Callable[[], None],
+    fn: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    """Await `fn(*args)` on `executor`, calling `on_cancel` if cancelled.
+
+    Shared body of the backends' async wrappers, so every backend releases
+    its device the same way when an awaiting task is cancelled.
+
+    Args:
+        executor: Backend executor to run `fn` on
+        on_cancel: Cleanup run before re-raising CancelledError, e.g. close()
+        fn: Blocking function to run
+        *args: Positional arguments for `fn`
+
+    Returns:
+        Whatever `fn` returns
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, fn, *args)
+    except asyncio.CancelledError:
+        on_cancel()
+        raise
+
+
+def shutdown_executor(name: str) -> None:
+    """Shut down backend `name`'s executor without waiting; no-op if unused.
+
+    Args:
+        name: Backend name, e.g. "truerng"
+    """
+    with _lock:
+        executor = _executors.pop(name, None)
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def shutdown_all() -> None:
+    """Shut down every backend's executor without waiting."""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False)
@@ -8,6 +8,9 @@ VID:PID is not found.
 """
 
 import time
+from functools import lru_cache
+
+import numpy as np
 
 from .ftdi import (
     FTDI_VENDOR_ID,
@@ -26,40 +29,92 @@ from .ftdi import (
 BB_VENDOR_ID = FTDI_VENDOR_ID
 BB_PRODUCT_ID = 0x7840
 
+# Largest read a single MPSSE read-bytes command can return
+_MPSSE_MAX_READ = 65536
+# Raw bytes per USB round trip: up to 4 read commands are queued in one write
+# and their output drained with one large bulk transfer
+_MAX_TRANSFER = 4 * _MPSSE_MAX_READ
+
 
+@lru_cache(maxsize=64)
 def real_bitrate(bitrate: int) -> int:
     """Clamp and quantize requested bitrate to a valid FTDI divisor.
 
     The FT232H uses a clock divisor; we bound the result to a safe range and
     quantize to the nearest achievable frequency.
     """
-    if bitrate >= 30_000_000:
-        return 30_000_000
-    if bitrate <= 458:
-        return 458
+    bitrate = max(458, min(30_000_000, bitrate))
     return 30_000_000 // (30_000_000 // bitrate)
 
 
+@lru_cache(maxsize=64)
+def _init_cmd(clk_div: int, enable_mask: int, disable_pol: int) -> bytes:
+    """Build the MPSSE pin/clock setup sent by `BitBabbler.init()`."""
+    return bytes(
+        [
+            MPSSE_NO_CLK_DIV5,
+            MPSSE_NO_ADAPTIVE_CLK,
+            MPSSE_NO_3PHASE_CLK,
+            MPSSE_SET_DATABITS_LOW,
+            0x00 | disable_pol,  # levels (CLK, DO, CS low)
+            0x0B | enable_mask,  # directions (CLK, DO, CS outputs)
+            MPSSE_SET_DATABITS_HIGH,
+            0x00,
+            0x00,
+            MPSSE_SET_CLK_DIVISOR,
+            (clk_div & 0xFF),
+            ((clk_div >> 8) & 0xFF),
+            MPSSE_NO_LOOPBACK,
+        ]
+    )
+
+
+@lru_cache(maxsize=128)
+def _read_cmd(nbytes: int) -> bytes:
+    """Build the MPSSE read bytes command (MSB, pos edge) for `nbytes`."""
+    return bytes(
+        [
+            MPSSE_DATA_BYTE_IN_POS_MSB,
+            (nbytes - 1) & 0xFF,
+            ((nbytes - 1) >> 8) & 0xFF,
+            MPSSE_SEND_IMMEDIATE,
+        ]
+    )
+
+
+def _fold_into(data: bytes, folds: int, out) -> None:
+    """XOR-fold `data` `folds` times straight into the writable buffer `out`.
+
+    `out` must hold exactly len(data) >> folds bytes. No validation is done;
+    callers guarantee the input length is a multiple of 2**folds.
+    """
+    src = np.frombuffer(data, dtype=np.uint8)
+    dst = np.frombuffer(out, dtype=np.uint8)
+    # XOR 8 bytes at a time when each output segment is uint64-aligned
+    if len(dst) % 8 == 0:
+        src = src.view(np.uint64)
+        dst = dst.view(np.uint64)
+    np.bitwise_xor.reduce(src.reshape(1 << folds, -1), axis=0, out=dst)
+
+
 def fold_bytes(data: bytes, folds: int) -> bytes:
     """Apply XOR folding to `data` `folds` times.
 
     Each fold halves the buffer length by XOR-ing the second half into the
     first half. Raises ValueError if the input length is not divisible by
     2**folds.
+
+    Applying `folds` halvings is the same as XOR-ing together the 2**folds
+    equal segments of the input, so all folds are done in a single reduction
+    pass instead of one pass per fold.
     """
     if folds <= 0:
         return bytes(data)
     if len(data) & ((1 << folds) - 1):
         raise ValueError(f"input length {len(data)} is not divisible by 2**{folds}")
-    b = bytearray(data)
-    length = len(b)
-    for _ in range(folds):
-        half = length // 2
-        # xor second half into first half
-        for i in range(half):
-            b[i] ^= b[half + i]
-        length = half
-    return bytes(b[:length])
+    out = np.empty(len(data) >> folds, dtype=np.uint8)
+    _fold_into(data, folds, out)
+    return out.tobytes()
 
 
 class BitBabbler(FTDIDevice):
@@ -98,14 +153,11 @@ class BitBabbler(FTDIDevice):
     def open(serial: str | None = None) -> "BitBabbler":
         """Open and initialize a BitBabbler device.
 
-        Attempts the canonical VID:PID first, then falls back to scanning all
+        Attempts the canonical VID:PID first, then falls back to scanning FTDI
         USB devices for manufacturer/product strings containing "BitBabbler".
         """
-        # First try the canonical VID/PID
-        base = FTDIDevice.find(BB_VENDOR_ID, BB_PRODUCT_ID, serial=serial)
-        if base is None:
-            # Fallback: scan all USB devices for BitBabbler strings
-            base = FTDIDevice.find_any_bitbabbler(serial=serial)
+        # One FTDI scan: canonical VID/PID preferred, BitBabbler strings fallback
+        base = FTDIDevice.find_any_bitbabbler(serial=serial, product_id=BB_PRODUCT_ID)
         if base is None:
             raise RuntimeError(
                 "BitBabbler device not found (tried VID:PID 0403:7840 and string scan)"
@@ -121,69 +173,72 @@ class BitBabbler(FTDIDevice):
             return False
         # device-specific init
         clk_div = 30_000_000 // self.bitrate - 1
-        cmd = bytes(
-            [
-                MPSSE_NO_CLK_DIV5,
-                MPSSE_NO_ADAPTIVE_CLK,
-                MPSSE_NO_3PHASE_CLK,
-                MPSSE_SET_DATABITS_LOW,
-                0x00 | self._disable_pol,  # levels (CLK, DO, CS low)
-                0x0B | self._enable_mask,  # directions (CLK, DO, CS outputs)
-                MPSSE_SET_DATABITS_HIGH,
-                0x00,
-                0x00,
-                MPSSE_SET_CLK_DIVISOR,
-                (clk_div & 0xFF),
-                ((clk_div >> 8) & 0xFF),
-                MPSSE_NO_LOOPBACK,
-            ]
-        )
+        cmd = _init_cmd(clk_div, self._enable_mask, self._disable_pol)
         self.write(cmd)
-        time.sleep(0.030)
-        # purge any residual data
-        try:
-            _ = self._read_raw(self.wMaxPacketSize)
-        except Exception:
-            pass
+        # purge any residual data: drain until the FTDI answers with status
+        # bytes only, bounded by the 30 ms settle time used previously
+        deadline = time.monotonic() + 0.030
+        while time.monotonic() < deadline:
+            try:
+                raw = self._read_raw(self.wMaxPacketSize)
+            except Exception:
+                continue
+            if not self._consume_packets_strip_status(raw):
+                break
         return True
 
     def read_entropy(self, nbytes: int) -> bytes:
-        """Read `nbytes` of raw entropy from the device (1..65536)."""
-        if nbytes < 1 or nbytes > 65536:
-            raise ValueError("nbytes must be 1..65536")
-        # Build MPSSE read bytes command (MSB, pos edge)
-        cmd = bytes(
-            [
-                MPSSE_DATA_BYTE_IN_POS_MSB,
-                (nbytes - 1) & 0xFF,
-                ((nbytes - 1) >> 8) & 0xFF,
-                MPSSE_SEND_IMMEDIATE,
-            ]
-        )
-        self.write(cmd)
+        """Read `nbytes` of raw entropy from the device (1.._MAX_TRANSFER).
+
+        Requests above one MPSSE command's 64 KiB limit queue several read
+        commands in a single write and read their output back in one go.
+        """
+        if nbytes < 1 or nbytes > _MAX_TRANSFER:
+            raise ValueError(f"nbytes must be 1..{_MAX_TRANSFER}")
+        if nbytes <= _MPSSE_MAX_READ:
+            self.write(_read_cmd(nbytes))
+        else:
+            self.write(
+                b"".join(
+                    _read_cmd(min(_MPSSE_MAX_READ, nbytes - off))
+                    for off in range(0, nbytes, _MPSSE_MAX_READ)
+                )
+            )
         return self.read_data(nbytes)
 
     def read_entropy_folded(self, out_len: int, folds: int) -> bytes:
         """Read `out_len` bytes after applying `folds` XOR folds.
 
-        Internally reads the necessary raw length per chunk while keeping each
-        raw transfer within 65536 bytes.
+        Reads up to `_MAX_TRANSFER` raw bytes per round trip and folds each
+        64 KiB MPSSE segment on its own, so the output matches folding one
+        command's worth of raw data at a time. Raises RuntimeError if the
+        device returns fewer bytes than requested.
         """
-        out = bytearray()
-        remain = out_len
-        if folds <= 0:
-            # Chunk plain reads up to device limit
-            while remain > 0:
-                chunk = max(1, min(remain, 65536))
-                out.extend(self.read_entropy(chunk))
-                remain -= chunk
-            return bytes(out)
-        # Each chunk we read raw_len = chunk_out << folds, keeping raw_len <= 65536
-        while remain > 0:
-            max_out_per_read = max(1, min(remain, 65536 >> folds))
-            raw_len = max_out_per_read << folds
+        folds = max(folds, 0)
+        # Preallocate the result and fill it in place chunk by chunk
+        out = bytearray(out_len)
+        mv = memoryview(out)
+        seg_out = _MPSSE_MAX_READ >> folds
+        pos = 0
+        while pos < out_len:
+            take = min(out_len - pos, _MAX_TRANSFER >> folds)
+            raw_len = take << folds
             raw = self.read_entropy(raw_len)
-            folded = fold_bytes(raw, folds)
-            out.extend(folded)
-            remain -= len(folded)
+            if len(raw) != raw_len:
+                raise RuntimeError(
+                    f"Short BitBabbler read: got {len(raw)} of {raw_len} bytes"
+                )
+            if not folds:
+                mv[pos : pos + take] = raw
+            else:
+                # Fold straight into the output slices; no intermediate bytes
+                raw_mv = memoryview(raw)
+                for off in range(0, take, seg_out):
+                    end = min(off + seg_out, take)
+                    _fold_into(
+                        raw_mv[off << folds : end << folds],
+                        folds,
+                        mv[pos + off : pos + end],
+                    )
+            pos += take
         return bytes(out)
@@ -19,20 +19,25 @@ Example:
 """
 
 import asyncio
-import math
+import struct
 import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
 
-# Module-level executor for async operations (1 worker to prevent concurrent hardware access)
-_executor = ThreadPoolExecutor(max_workers=1)
+from .._executor import get_executor, run_cancellable, shutdown_executor
 
 
 def _get_executor() -> ThreadPoolExecutor:
-    """Get the executor, recreating it if it was shut down."""
-    global _executor
-    if getattr(_executor, "_shutdown", False):
-        _executor = ThreadPoolExecutor(max_workers=1)
-    return _executor
+    """Get this backend's single-worker executor from the shared registry."""
+    return get_executor("bitbabbler_rng")
+
+
+# Rejection-sampling candidates drawn per device read in random_int
+_RANDOM_INT_CANDIDATES = 8
+# Big-endian unpackers for the word-sized candidate widths in random_int
+_WORD_UNPACK = {
+    n: struct.Struct(f">{code}") for n, code in ((1, "B"), (2, "H"), (4, "I"), (8, "Q"))
+}
 
 
 # Import bbpy modules from same package
@@ -117,10 +122,8 @@ def get_bytes(n: int, folds: int = 0) -> bytes:
         raise RuntimeError("BitBabbler device not found")
 
     try:
-        if folds > 0:
-            return dev.read_entropy_folded(n, folds)
-        else:
-            return dev.read_entropy(n)
+        # Chunks into large queued transfers; folds=0 is a plain raw read
+        return dev.read_entropy_folded(n, folds)
     except Exception as e:
         # Reset cache on error
         global _cached_device
@@ -177,6 +180,28 @@ def get_exact_bits(n: int, folds: int = 0) -> bytes:
     return get_bytes(n_bytes, folds=folds)
 
 
+def iter_bytes(chunk: int, folds: int = 0) -> Iterator[bytes]:
+    """Stream random bytes from BitBabbler in `chunk`-sized reads, indefinitely.
+
+    Lets long runs consume entropy with O(chunk) memory instead of one large
+    get_bytes() call. Arguments are validated by get_bytes() on the first
+    iteration.
+
+    Args:
+        chunk: Bytes per yielded chunk. Must be positive.
+        folds: XOR folding level (0=raw, 1-4=whitened). Defaults to 0.
+
+    Yields:
+        Random byte chunks of length `chunk`.
+
+    Raises:
+        ValueError: If chunk <= 0 or invalid folds
+        RuntimeError: If device not found or read fails
+    """
+    while True:
+        yield get_bytes(chunk, folds=folds)
+
+
 def _bytes_to_int(data: bytes) -> int:
     """Convert bytes to integer."""
     return int.from_bytes(data, "big")
@@ -206,17 +231,32 @@ def random_int(min_val: int = 0, max_val: int | None = None, folds: int = 0) ->
         )
 
     range_size = max_val - min_val
-    bits_needed = max(1, math.ceil(math.log2(range_size)))
+    # Exact integer width of the largest offset; no float log2 rounding
+    bits_needed = max(1, (range_size - 1).bit_length())
     n_bytes = (bits_needed + 7) // 8
 
-    # Use rejection sampling for uniform distribution
+    mask = (1 << bits_needed) - 1
+    if range_size & mask == 0:
+        # Power-of-two range: every masked sample is in range, no rejection
+        return min_val + (_bytes_to_int(get_bytes(n_bytes, folds=folds)) & mask)
+    # Rejection sampling for uniform distribution. Each candidate is accepted
+    # with p >= 1/2, so drawing a batch per device read makes a second read
+    # unlikely (p <= 1/256)
+    batch = n_bytes * _RANDOM_INT_CANDIDATES
+    unpack = _WORD_UNPACK.get(n_bytes)
     while True:
-        data = get_bytes(n_bytes, folds=folds)
-        val = _bytes_to_int(data)
-        # Mask off extra bits to get exactly bits_needed bits
-        val &= (1 << bits_needed) - 1
-        if val < range_size:
-            return min_val + val
+        data = get_bytes(batch, folds=folds)
+        if unpack is not None:
+            candidates = (word for (word,) in unpack.iter_unpack(data))
+        else:
+            candidates = (
+                _bytes_to_int(data[j : j + n_bytes]) for j in range(0, batch, n_bytes)
+            )
+        for val in candidates:
+            # Mask off extra bits to get exactly bits_needed bits
+            val &= mask
+            if val < range_size:
+                return min_val + val
 
 
 def close() -> None:
@@ -258,13 +298,7 @@ async def get_bytes_async(n: int, folds: int = 0) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RuntimeError: If device not found or read fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_bytes, n, folds)
-    except asyncio.CancelledError:
-        # Cleanup on cancellation
-        close()
-        raise
+    return await run_cancellable(_get_executor(), close, get_bytes, n, folds)
 
 
 async def get_bits_async(n: int, folds: int = 0) -> bytes:
@@ -282,12 +316,7 @@ async def get_bits_async(n: int, folds: int = 0) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RuntimeError: If device not found or read fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_bits, n, folds)
-    except asyncio.CancelledError:
-        close()
-        raise
+    return await run_cancellable(_get_executor(), close, get_bits, n, folds)
 
 
 async def get_exact_bits_async(n: int, folds: int = 0) -> bytes:
@@ -305,12 +334,7 @@ async def get_exact_bits_async(n: int, folds: int = 0) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RuntimeError: If device not found or read fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_exact_bits, n, folds)
-    except asyncio.CancelledError:
-        close()
-        raise
+    return await run_cancellable(_get_executor(), close, get_exact_bits, n, folds)
 
 
 async def random_int_async(
@@ -331,14 +355,9 @@ async def random_int_async(
         asyncio.CancelledError: If operation is cancelled
         RuntimeError: If device not found or read fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(
-            _get_executor(), random_int, min_val, max_val, folds
-        )
-    except asyncio.CancelledError:
-        close()
-        raise
+    return await run_cancellable(
+        _get_executor(), close, random_int, min_val, max_val, folds
+    )
 
 
 async def close_async() -> None:
@@ -346,9 +365,8 @@ async def close_async() -> None:
 
     Calls sync close() and shuts down the executor.
     """
-    global _executor
     loop = asyncio.get_running_loop()
     try:
         await loop.run_in_executor(_get_executor(), close)
     finally:
-        _executor.shutdown(wait=False)
+        shutdown_executor("bitbabbler_rng")
@@ -1,7 +1,10 @@
+import array
 import os
 import time
 from typing import Optional
 
+import numpy as np
+
 # Try to select libusb1 backend explicitly before importing usb.core
 from usb.backend import libusb1 as _libusb1
 
@@ -39,6 +42,10 @@ import usb.util
 
 FTDI_VENDOR_ID = 0x0403
 
+# Bulk IN buffers kept by _read_raw; enough for the steady full-size request,
+# its remainder reads and the init/purge reads without growing per remainder
+_READ_BUF_SLOTS = 4
+
 
 # FTDI control requests
 FTDI_SIO_RESET = 0x00
@@ -79,6 +86,41 @@ MPSSE_NO_3PHASE_CLK = 0x8D
 MPSSE_NO_ADAPTIVE_CLK = 0x97
 
 
+# USB string descriptors seen during discovery, keyed by device location/IDs
+# and string index. A replugged device gets a new address, so stale entries
+# are never matched; the cache is simply cleared when it grows too large.
+_USB_STRING_CACHE_MAX = 256
+_usb_string_cache: dict[tuple[int, int, int, int, int], str] = {}
+
+
+def _get_usb_string(dev: usb.core.Device, index: int) -> str:
+    """Return USB string descriptor `index`, cached across discovery scans.
+
+    Raises whatever PyUSB raises if the control transfer fails; failed reads
+    are not cached.
+    """
+    key = (dev.bus, dev.address, dev.idVendor, dev.idProduct, index)
+    value = _usb_string_cache.get(key)
+    if value is None:
+        value = usb.util.get_string(dev, index) or ""
+        if len(_usb_string_cache) >= _USB_STRING_CACHE_MAX:
+            _usb_string_cache.clear()
+        _usb_string_cache[key] = value
+    return value
+
+
+def _has_bitbabbler_strings(dev: usb.core.Device) -> bool:
+    """Return True if the manufacturer or product string names a BitBabbler."""
+    try:
+        manufacturer = (
+            _get_usb_string(dev, dev.iManufacturer) if dev.iManufacturer else ""
+        )
+        product = _get_usb_string(dev, dev.iProduct) if dev.iProduct else ""
+    except Exception:
+        return False
+    return "bitbabbler" in f"{manufacturer} {product}".lower()
+
+
 class FTDIDevice:
     """Minimal FTDI/libusb wrapper to drive FT232H in MPSSE mode with PyUSB."""
 
@@ -95,11 +137,16 @@ class FTDIDevice:
         self.in_ep = in_ep
         self.out_ep = out_ep
         self.wMaxPacketSize = wMaxPacketSize
+        # Payload bytes per IN packet after the 2 FTDI status bytes
+        self._payload_stride = wMaxPacketSize - 2
         self.interface_index = interface_index  # FTDI interface A = 1
         self.timeout_ms = timeout_ms
 
         # Internal read buffer state (similar to C++ chunking)
         self._rbuf = bytearray()
+        # Reusable bulk IN buffers keyed by request size, least recently used
+        # first and capped at _READ_BUF_SLOTS (see _read_raw)
+        self._read_bufs: dict[int, array.array] = {}
 
     # ---------- Device discovery ----------
     @staticmethod
@@ -118,7 +165,7 @@ class FTDIDevice:
 
             def _match(d):
                 try:
-                    return usb.util.get_string(d, d.iSerialNumber) == serial
+                    return _get_usb_string(d, d.iSerialNumber) == serial
                 except Exception:
                     return False
 
@@ -126,9 +173,83 @@ class FTDIDevice:
         if dev is None:
             return None
 
+        ftdi = FTDIDevice._open_usb_device(dev)
+        if ftdi is None:
+            raise RuntimeError("Failed to find bulk IN/OUT endpoints")
+        return ftdi
+
+    @staticmethod
+    def find_any_bitbabbler(
+        serial: str | None = None, product_id: int | None = None
+    ) -> Optional["FTDIDevice"]:
+        """Find any connected BitBabbler by scanning USB strings.
+
+        This scans USB devices with the FTDI vendor ID and selects the first
+        whose manufacturer or product string contains "bitbabbler"
+        (case-insensitive). If a serial is provided, it must match exactly.
+
+        If `product_id` is given, a device with that PID is preferred and
+        matched without reading its strings, so the canonical VID:PID lookup
+        and the string fallback share one enumeration walk. Setup errors on a
+        preferred-PID device are raised; string matches that fail are skipped.
+        """
+        # Pass backend explicitly if we have one
+        find_kwargs = {}
+        if _backend is not None:
+            find_kwargs["backend"] = _backend
+
+        # String matches, tried in scan order if no preferred-PID device opens
+        candidates = []
+        # BitBabblers are FT232H based, so only FTDI devices need string reads
+        for dev in usb.core.find(find_all=True, idVendor=FTDI_VENDOR_ID, **find_kwargs):
+            canonical = product_id is not None and dev.idProduct == product_id
+            if not canonical and not _has_bitbabbler_strings(dev):
+                continue
+
+            if serial is not None:
+                try:
+                    dev_serial = (
+                        _get_usb_string(dev, dev.iSerialNumber)
+                        if dev.iSerialNumber
+                        else None
+                    )
+                except Exception:
+                    dev_serial = None
+                if dev_serial != serial:
+                    continue
+
+            if canonical:
+                # Canonical device: let setup errors (e.g. permissions) surface
+                ftdi = FTDIDevice._open_usb_device(dev)
+                if ftdi is None:
+                    raise RuntimeError("Failed to find bulk IN/OUT endpoints")
+                return ftdi
+            candidates.append(dev)
+
+        for dev in candidates:
+            try:
+                ftdi = FTDIDevice._open_usb_device(dev)
+            except Exception:
+                # Not suitable
+                continue
+            if ftdi is not None:
+                return ftdi
+
+        return None
+
+    @staticmethod
+    def _open_usb_device(dev: usb.core.Device) -> Optional["FTDIDevice"]:
+        """Configure and claim interface 0 of `dev` and wrap it.
+
+        Returns None if the interface has no bulk IN/OUT endpoint pair.
+        """
         # Ensure configured
-        if dev.get_active_configuration() is None:
-            dev.set_configuration()
+        try:
+            if dev.get_active_configuration() is None:
+                dev.set_configuration()
+        except Exception:
+            # Some backends raise if already configured; ignore
+            pass
 
         cfg = dev.get_active_configuration()
         intf = usb.util.find_descriptor(cfg, bInterfaceNumber=0, bAlternateSetting=0)
@@ -136,7 +257,7 @@ class FTDIDevice:
             # fallback: first interface
             intf = cfg[(0, 0)]
 
-        # claim if needed (ignore errors on Windows)
+        # Claim interface when needed; ignore errors on Windows
         try:
             if usb.util.device_has_kernel_driver(dev, intf.bInterfaceNumber):
                 try:
@@ -159,102 +280,10 @@ class FTDIDevice:
             else:
                 out_ep = addr
         if in_ep is None or out_ep is None:
-            raise RuntimeError("Failed to find bulk IN/OUT endpoints")
+            return None
 
         return FTDIDevice(dev, in_ep, out_ep, wMaxPacketSize)
 
-    @staticmethod
-    def find_any_bitbabbler(serial: str | None = None) -> Optional["FTDIDevice"]:
-        """Find any connected BitBabbler by scanning USB strings.
-
-        This scans all USB devices and selects the first whose manufacturer or
-        product string contains "bitbabbler" (case-insensitive). If a serial is
-        provided, it must match exactly.
-        """
-        # Pass backend explicitly if we have one
-        find_kwargs = {}
-        if _backend is not None:
-            find_kwargs["backend"] = _backend
-
-        try:
-            for dev in usb.core.find(find_all=True, **find_kwargs):
-                try:
-                    manufacturer = (
-                        usb.util.get_string(dev, dev.iManufacturer)
-                        if dev.iManufacturer
-                        else ""
-                    )
-                    product = (
-                        usb.util.get_string(dev, dev.iProduct) if dev.iProduct else ""
-                    )
-                except Exception:
-                    manufacturer = ""
-                    product = ""
-
-                text = f"{manufacturer} {product}".lower()
-                if "bitbabbler" not in text:
-                    continue
-
-                if serial is not None:
-                    try:
-                        dev_serial = (
-                            usb.util.get_string(dev, dev.iSerialNumber)
-                            if dev.iSerialNumber
-                            else None
-                        )
-                    except Exception:
-                        dev_serial = None
-                    if dev_serial != serial:
-                        continue
-
-                # Ensure configured
-                try:
-                    if dev.get_active_configuration() is None:
-                        dev.set_configuration()
-                except Exception:
-                    # Some backends raise if already configured; ignore
-                    pass
-
-                cfg = dev.get_active_configuration()
-                intf = usb.util.find_descriptor(
-                    cfg, bInterfaceNumber=0, bAlternateSetting=0
-                )
-                if intf is None:
-                    # fallback: first interface
-                    intf = cfg[(0, 0)]
-
-                # Claim interface when needed; ignore errors on Windows
-                try:
-                    if usb.util.device_has_kernel_driver(dev, intf.bInterfaceNumber):
-                        try:
-                            dev.detach_kernel_driver(intf.bInterfaceNumber)
-                        except Exception:
-                            pass
-                    usb.util.claim_interface(dev, intf.bInterfaceNumber)
-                except Exception:
-                    pass
-
-                # Endpoints: choose bulk IN and bulk OUT
-                in_ep = None
-                out_ep = None
-                wMaxPacketSize = 64
-                for ep in intf.endpoints():
-                    addr = ep.bEndpointAddress
-                    if addr & 0x80:
-                        in_ep = addr
-                        wMaxPacketSize = ep.wMaxPacketSize
-                    else:
-                        out_ep = addr
-                if in_ep is None or out_ep is None:
-                    # Not suitable
-                    continue
-
-                return FTDIDevice(dev, in_ep, out_ep, wMaxPacketSize)
-        except Exception:
-            pass
-
-        return None
-
     # ---------- FTDI control helpers ----------
     def _ctrl_out(self, request: int, value: int, index: int) -> None:
         self.dev.ctrl_transfer(0x40, request, value, index, None, self.timeout_ms)
@@ -314,32 +343,47 @@ class FTDIDevice:
         # write may need chunking; usb core handles chunking but keep it simple
         self.dev.write(self.out_ep, data, self.timeout_ms)
 
-    def _read_raw(self, size: int) -> bytes:
+    def _read_raw(self, size: int) -> memoryview:
+        """Bulk-read up to `size` bytes (rounded up to whole packets).
+
+        Reads in place into a cached per-size buffer, so the returned
+        memoryview is only valid until the next `_read_raw` call.
+        """
         # Read a multiple of wMaxPacketSize to avoid overflow from device
         if size % self.wMaxPacketSize:
             size += self.wMaxPacketSize - (size % self.wMaxPacketSize)
-        data = self.dev.read(self.in_ep, size, self.timeout_ms)
-        return bytes(data)
-
-    def _consume_packets_strip_status(self, data: bytes) -> bytes:
+        # PyUSB reads len(buffer) bytes into an array.array (no memoryview
+        # slices), so keep a few exact-size buffers; short transfers leave
+        # ever-changing remainder sizes, hence the LRU cap
+        buf = self._read_bufs.pop(size, None)
+        if buf is None:
+            if len(self._read_bufs) >= _READ_BUF_SLOTS:
+                del self._read_bufs[next(iter(self._read_bufs))]
+            buf = usb.util.create_buffer(size)
+        self._read_bufs[size] = buf
+        n = self.dev.read(self.in_ep, buf, self.timeout_ms)
+        return memoryview(buf)[:n]
+
+    def _consume_packets_strip_status(self, data: bytes | memoryview) -> bytes:
         # FTDI prepends modem+line status in the first two bytes of every packet
         if not data:
             return b""
-        out = bytearray()
-        i = 0
         plen = self.wMaxPacketSize
-        # Iterate over USB packets inside the buffer
-        while i < len(data):
-            chunk = data[i : i + plen]
-            if len(chunk) == 0:
-                break
-            if len(chunk) < 2:
-                # incomplete packet status; drop
-                break
-            # drop first two status bytes
-            out.extend(chunk[2:])
-            i += plen
-        return bytes(out)
+        size = len(data)
+        if size <= plen:
+            # Single (often status-only) packet; not worth a NumPy round trip
+            return bytes(data[2:])
+        full = size - size % plen
+        step = self._payload_stride
+        # Short final packet; fewer than 2 bytes is incomplete status, drop
+        tail = max(0, size - full - 2)
+        src = np.frombuffer(data, dtype=np.uint8)
+        body = (full // plen) * step
+        out = np.empty(body + tail, dtype=np.uint8)
+        # One strided copy drops the status bytes of every full packet
+        out[:body].reshape(-1, step)[:] = src[:full].reshape(-1, plen)[:, 2:]
+        out[body:] = src[full + 2 : full + 2 + tail]
+        return out.tobytes()
 
     def read_data(self, nbytes: int) -> bytes:
         out = bytearray()
@@ -348,8 +392,12 @@ class FTDIDevice:
             take = min(nbytes, len(self._rbuf))
             out.extend(self._rbuf[:take])
             del self._rbuf[:take]
+        # Every packet carries 2 status bytes, so size requests by payload per
+        # packet; asking for just the payload length costs an extra transfer
+        stride = self._payload_stride
         while len(out) < nbytes:
-            raw = self._read_raw(max(self.wMaxPacketSize, nbytes - len(out)))
+            packets = -(-(nbytes - len(out)) // stride)
+            raw = self._read_raw(packets * self.wMaxPacketSize)
             payload = self._consume_packets_strip_status(raw)
             if not payload:
                 # avoid tight loop
@@ -392,21 +440,32 @@ class FTDIDevice:
                 _ = self.get_modem_status()
             except Exception:
                 pass
-            if self._check_sync(0xAA) and self._check_sync(0xAB):
+            if self._check_sync_pair([0xAA, 0xAB]):
                 return True
         return False
 
     def _check_sync(self, cmd: int) -> bool:
-        self.write(bytes([cmd, MPSSE_SEND_IMMEDIATE]))
-        # Poll a few times for the expected 0xFA, cmd sequence
-        for _ in range(10):
+        return self._check_sync_pair([cmd])
+
+    def _check_sync_pair(self, cmds: list[int]) -> bool:
+        # Send every probe up front so their echoes share the same reads
+        self.write(bytes(c for cmd in cmds for c in (cmd, MPSSE_SEND_IMMEDIATE)))
+        # Poll for each expected 0xFA, cmd sequence within the same ~50 ms
+        # budget as before, but in 1 ms steps so a prompt echo returns early
+        pending = {bytes([0xFA, cmd]) for cmd in cmds}
+        # Last byte of the previous read, so a pair split across reads matches
+        carry = b""
+        deadline = time.monotonic() + 0.050
+        while True:
             try:
                 data = self._read_raw(max(self.wMaxPacketSize, 512))
             except Exception:
-                time.sleep(0.005)
-                continue
-            for i in range(len(data) - 1):
-                if data[i] == 0xFA and data[i + 1] == cmd:
-                    return True
-            time.sleep(0.005)
-        return False
+                data = b""
+            window = carry + data
+            pending = {p for p in pending if window.find(p) == -1}
+            if not pending:
+                return True
+            carry = bytes(data[-1:])
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
@@ -10,8 +10,18 @@ import ctypes
 import math
 import os
 import platform
+import struct
 from concurrent.futures import ThreadPoolExecutor
 
+from .._executor import get_executor, run_cancellable, shutdown_executor
+
+# Rejection-sampling candidates drawn per RDSEED call in random_int
+_RANDOM_INT_CANDIDATES = 8
+# Big-endian unpackers for the word-sized candidate widths in random_int
+_WORD_UNPACK = {
+    n: struct.Struct(f">{code}") for n, code in ((1, "B"), (2, "H"), (4, "I"), (8, "Q"))
+}
+
 
 class RDSEEDError(Exception):
     """Exception raised when RDSEED operations fail."""
@@ -56,6 +66,8 @@ class IntelSeed:
             ctypes.c_size_t,
         ]
         self.lib.rdseed_bytes.restype = ctypes.c_size_t
+        # Bind once; CDLL attribute access goes through __getattr__ each time
+        self._rdseed_bytes = self.lib.rdseed_bytes
 
         # Test if RDSEED is available
         try:
@@ -81,12 +93,46 @@ class IntelSeed:
             raise ValueError("n_bytes must be positive")
 
         buf = (ctypes.c_uint8 * n_bytes)()
+        self._fill(buf, n_bytes)
+        return bytes(buf)
+
+    def get_bytes_into(self, out: bytearray | memoryview) -> int:
+        """
+        Fill a caller-provided writable buffer with raw entropy from RDSEED.
+
+        RDSEED writes directly into `out`, so no intermediate buffer or copy
+        is made.
+
+        Args:
+            out: Writable, C-contiguous buffer (must be non-empty). Any item
+                format is accepted, e.g. memoryview(array("I", ...)); the
+                whole buffer is filled byte for byte.
+
+        Returns:
+            int: Number of bytes written (always memoryview(out).nbytes).
+
+        Raises:
+            RDSEEDError: If the buffer cannot be filled.
+            ValueError: If out is empty.
+            TypeError: If out is read-only or not C-contiguous.
+        """
+        # Count bytes, not items: len() of a non-"B" memoryview is in items
+        mv = memoryview(out).cast("B")
+        n_bytes = mv.nbytes
+        if n_bytes <= 0:
+            raise ValueError("out must not be empty")
+
+        self._fill((ctypes.c_uint8 * n_bytes).from_buffer(mv), n_bytes)
+        return n_bytes
+
+    def _fill(self, buf: ctypes.Array, n_bytes: int) -> None:
+        """Run rdseed_bytes on a ctypes buffer, retrying short writes."""
         max_retries = 3
 
         for attempt in range(max_retries):
-            written = self.lib.rdseed_bytes(buf, n_bytes)
+            written = self._rdseed_bytes(buf, n_bytes)
             if written == n_bytes:
-                return bytes(buf)
+                return
             if written == 0:
                 raise RDSEEDError(
                     f"RDSEED failed: no bytes generated on attempt {attempt + 1}"
@@ -170,16 +216,32 @@ class IntelSeed:
             )
 
         range_size = max_val - min_val
-        bits_needed = max(1, math.ceil(math.log2(range_size)))
+        # Exact integer width of the largest offset; no float log2 rounding
+        bits_needed = max(1, (range_size - 1).bit_length())
         n_bytes = (bits_needed + 7) // 8
-
+        mask = (1 << bits_needed) - 1
+        if range_size & mask == 0:
+            # Power-of-two range: every masked sample is in range, no rejection
+            return min_val + (int.from_bytes(self.get_bytes(n_bytes), "big") & mask)
+        # Each candidate is accepted with p >= 1/2, so drawing a batch per
+        # RDSEED call makes a second call unlikely (p <= 1/256)
+        batch = n_bytes * _RANDOM_INT_CANDIDATES
+
+        unpack = _WORD_UNPACK.get(n_bytes)
         while True:
-            data = self.get_bytes(n_bytes)
-            value = int.from_bytes(data, "big")
-            # Mask off extra bits to get exactly bits_needed bits
-            value &= (1 << bits_needed) - 1
-            if value < range_size:
-                return min_val + value
+            data = self.get_bytes(batch)
+            if unpack is not None:
+                candidates = (word for (word,) in unpack.iter_unpack(data))
+            else:
+                candidates = (
+                    int.from_bytes(data[j : j + n_bytes], "big")
+                    for j in range(0, batch, n_bytes)
+                )
+            for value in candidates:
+                # Mask off extra bits to get exactly bits_needed bits
+                value &= mask
+                if value < range_size:
+                    return min_val + value
 
 
 def is_rdseed_available(library_path: str | None = None) -> bool:
@@ -244,16 +306,15 @@ def close() -> None:
         _rdseed = None
 
 
-# Module-level executor for async operations (1 worker to prevent concurrent hardware access)
-_executor = ThreadPoolExecutor(max_workers=1)
+def _get_executor() -> ThreadPoolExecutor:
+    """Get this backend's executor (RNG_TUI_THREAD_POOL workers) from the registry."""
+    return get_executor("intel_seed", concurrent=True)
 
 
-def _get_executor() -> ThreadPoolExecutor:
-    """Get the executor, recreating it if it was shut down."""
-    global _executor
-    if getattr(_executor, "_shutdown", False):
-        _executor = ThreadPoolExecutor(max_workers=1)
-    return _executor
+# Async requests below this many bytes run inline: RDSEED fills 512 bytes in
+# about as long as one executor round trip (~60 us), so smaller requests block
+# the event loop for less time than the hop would add
+_ASYNC_THRESHOLD = 512
 
 
 # Global instance for convenience
@@ -317,8 +378,8 @@ def random_int(min_val: int = 0, max_val: int | None = None) -> int:
 async def get_bytes_async(n: int) -> bytes:
     """Async version of get_bytes.
 
-    Non-blocking for GUI applications. Uses thread pool executor
-    to run sync operation in background thread.
+    Non-blocking for GUI applications. Requests of 512 bytes or more run
+    in the thread pool executor; smaller ones are generated inline.
 
     Args:
         n: Number of bytes to generate. Must be positive.
@@ -331,13 +392,9 @@ async def get_bytes_async(n: int) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RDSEEDError: If RDSEED operation fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_bytes, n)
-    except asyncio.CancelledError:
-        # Cleanup on cancellation
-        close()
-        raise
+    if n < _ASYNC_THRESHOLD:
+        return get_bytes(n)
+    return await run_cancellable(_get_executor(), close, get_bytes, n)
 
 
 async def get_bits_async(n: int) -> bytes:
@@ -354,12 +411,9 @@ async def get_bits_async(n: int) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RDSEEDError: If RDSEED operation fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_bits, n)
-    except asyncio.CancelledError:
-        close()
-        raise
+    if n < _ASYNC_THRESHOLD * 8:
+        return get_bits(n)
+    return await run_cancellable(_get_executor(), close, get_bits, n)
 
 
 async def get_exact_bits_async(n: int) -> bytes:
@@ -376,17 +430,17 @@ async def get_exact_bits_async(n: int) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RDSEEDError: If RDSEED operation fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_exact_bits, n)
-    except asyncio.CancelledError:
-        close()
-        raise
+    if n < _ASYNC_THRESHOLD * 8:
+        return get_exact_bits(n)
+    return await run_cancellable(_get_executor(), close, get_exact_bits, n)
 
 
 async def random_int_async(min_val: int = 0, max_val: int | None = None) -> int:
     """Async version of random_int.
 
+    Ranges narrower than 512 bits are generated inline; wider ones run in the
+    thread pool executor.
+
     Args:
         min_val: Minimum value (inclusive). Defaults to 0.
         max_val: Maximum value (exclusive). If None, generates using full range.
@@ -399,12 +453,11 @@ async def random_int_async(min_val: int = 0, max_val: int | None = None) -> int:
         asyncio.CancelledError: If operation is cancelled
         RDSEEDError: If RDSEED operation fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), random_int, min_val, max_val)
-    except asyncio.CancelledError:
-        close()
-        raise
+    # A batch of rejection candidates takes about one byte per bit of range
+    # width, so ranges narrower than _ASYNC_THRESHOLD bits run inline
+    if max_val is None or (max_val - min_val).bit_length() < _ASYNC_THRESHOLD:
+        return random_int(min_val, max_val)
+    return await run_cancellable(_get_executor(), close, random_int, min_val, max_val)
 
 
 async def close_async() -> None:
@@ -412,12 +465,11 @@ async def close_async() -> None:
 
     Calls sync close() and shuts down the executor.
     """
-    global _executor
     loop = asyncio.get_running_loop()
     try:
         await loop.run_in_executor(_get_executor(), close)
     finally:
-        _executor.shutdown(wait=False)
+        shutdown_executor("intel_seed")
 
 
 # Example usage
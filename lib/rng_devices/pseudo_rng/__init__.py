@@ -33,6 +33,7 @@ from .core import (
     get_bits_async,
     get_bytes,
     get_bytes_async,
+    get_counts,
     get_exact_bits,
     get_exact_bits_async,
     is_device_available,
@@ -47,6 +48,7 @@ __all__ = [
     "get_bits",
     "get_exact_bits",
     "random_int",
+    "get_counts",
     "close",
     # Async API
     "get_bytes_async",
@@ -5,19 +5,94 @@ secrets module. Serves as a fallback when hardware RNGs are not available.
 """
 
 import asyncio
+import os
 import secrets
+import threading
 from concurrent.futures import ThreadPoolExecutor
 
-# Module-level executor (1 worker for async operations)
-_executor = ThreadPoolExecutor(max_workers=1)
+import numpy as np
+
+from ...services.bitcount import popcount_blocks
+from .._executor import get_executor, run_cancellable, shutdown_executor
 
 
 def _get_executor() -> ThreadPoolExecutor:
-    """Get the executor, recreating it if it was shut down."""
-    global _executor
-    if _executor._shutdown:
-        _executor = ThreadPoolExecutor(max_workers=1)
-    return _executor
+    """Get this backend's executor (RNG_TUI_THREAD_POOL workers) from the registry."""
+    return get_executor("pseudo_rng", concurrent=True)
+
+
+# Async requests below this many bytes run inline; the executor hop costs more
+# than generating them
+_ASYNC_THRESHOLD = 4096
+
+# Small requests are served from one os.urandom() refill instead of a syscall
+# each; requests of at least half the pool go straight to os.urandom
+_POOL_SIZE = 8192
+_pool = b""
+_pool_pos = 0
+_pool_lock = threading.Lock()
+
+
+def _reset_pool() -> None:
+    """Discard buffered entropy (so a forked child never replays the parent's)."""
+    global _pool, _pool_pos, _pool_lock, _words
+    _pool = b""
+    _pool_pos = 0
+    _words = iter(())
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool)
+
+
+def _draw(n: int) -> bytes:
+    """Return n random bytes, slicing small requests from the entropy pool."""
+    global _pool, _pool_pos
+    if n >= _POOL_SIZE // 2:
+        return os.urandom(n)
+    with _pool_lock:
+        if _pool_pos + n > len(_pool):
+            _pool = os.urandom(_POOL_SIZE)
+            _pool_pos = 0
+        out = _pool[_pool_pos : _pool_pos + n]
+        _pool_pos += n
+    return out
+
+
+_U64_MASK = (1 << 64) - 1
+# 64-bit words for _bounded, unpacked from one os.urandom() refill at a time
+_words = iter(())
+
+
+def _draw_u64() -> int:
+    """Return one random 64-bit word from the word stream."""
+    global _words
+    try:
+        return next(_words)
+    except StopIteration:
+        with _pool_lock:
+            _words = iter(memoryview(os.urandom(_POOL_SIZE)).cast("Q"))
+            return next(_words)
+
+
+def _bounded(b: int) -> int:
+    """Return a uniform integer in [0, b) (Lemire's multiply-and-shift method).
+
+    One 64-bit draw and one multiply in the common case; a rejection only
+    happens when the low word falls below (2**64 - b) % b. Bounds above 2**64
+    fall back to secrets.randbelow.
+    """
+    if b > 1 << 64:
+        return secrets.randbelow(b)
+    m = _draw_u64() * b
+    low = m & _U64_MASK
+    if low < b:
+        threshold = ((1 << 64) - b) % b
+        while low < threshold:
+            m = _draw_u64() * b
+            low = m & _U64_MASK
+    return m >> 64
 
 
 def is_device_available() -> bool:
@@ -45,7 +120,7 @@ def get_bytes(n: int) -> bytes:
     """
     if n <= 0:
         raise ValueError(f"n must be positive, got {n}")
-    return secrets.token_bytes(n)
+    return _draw(n)
 
 
 def get_bits(n: int) -> bytes:
@@ -66,7 +141,7 @@ def get_bits(n: int) -> bytes:
     if n <= 0:
         raise ValueError(f"n must be positive, got {n}")
     n_bytes = (n + 7) // 8
-    return secrets.token_bytes(n_bytes)
+    return _draw(n_bytes)
 
 
 def get_exact_bits(n: int) -> bytes:
@@ -90,7 +165,7 @@ def get_exact_bits(n: int) -> bytes:
         raise ValueError(f"n must be divisible by 8, got {n}")
 
     n_bytes = n // 8
-    return secrets.token_bytes(n_bytes)
+    return _draw(n_bytes)
 
 
 def random_int(min_val: int = 0, max_val: int | None = None) -> int:
@@ -109,14 +184,42 @@ def random_int(min_val: int = 0, max_val: int | None = None) -> int:
     if max_val is None:
         if min_val < 0:
             raise ValueError("min_val must be non-negative when max_val is None")
-        return secrets.randbelow(min_val) if min_val > 0 else secrets.randbits(32)
+        return _bounded(min_val) if min_val > 0 else int.from_bytes(_draw(4), "little")
 
     if min_val >= max_val:
         raise ValueError(
             f"min_val must be less than max_val, got min_val={min_val}, max_val={max_val}"
         )
 
-    return min_val + secrets.randbelow(max_val - min_val)
+    return min_val + _bounded(max_val - min_val)
+
+
+def get_counts(n_blocks: int, block_bits: int) -> np.ndarray:
+    """Generate n_blocks random blocks and return the '1' bit count of each.
+
+    Pulls all n_blocks * block_bits bits in a single draw and counts every
+    block in one vectorized pass, for simulation and backfill paths that
+    need many samples at once.
+
+    Args:
+        n_blocks: Number of blocks. Must be positive.
+        block_bits: Bits per block. Must be positive and divisible by 8.
+
+    Returns:
+        int64 array of length n_blocks with the ones count of each block.
+
+    Raises:
+        ValueError: If n_blocks <= 0, or block_bits <= 0 or not divisible by 8
+    """
+    if n_blocks <= 0:
+        raise ValueError(f"n_blocks must be positive, got {n_blocks}")
+    if block_bits <= 0 or block_bits % 8 != 0:
+        raise ValueError(
+            f"block_bits must be positive and divisible by 8, got {block_bits}"
+        )
+    block_bytes = block_bits // 8
+    raw = np.frombuffer(_draw(n_blocks * block_bytes), dtype=np.uint8)
+    return popcount_blocks(raw, block_bytes)
 
 
 def close() -> None:
@@ -136,8 +239,8 @@ def close() -> None:
 async def get_bytes_async(n: int) -> bytes:
     """Async version of get_bytes.
 
-    Non-blocking for GUI applications. Uses thread pool executor
-    to run sync operation in background thread.
+    Non-blocking for GUI applications. Requests of 4 KiB or more run in
+    the thread pool executor; smaller ones are generated inline.
 
     Args:
         n: Number of bytes to generate. Must be positive.
@@ -149,13 +252,9 @@ async def get_bytes_async(n: int) -> bytes:
         ValueError: If n <= 0
         asyncio.CancelledError: If operation is cancelled
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_bytes, n)
-    except asyncio.CancelledError:
-        # Cleanup on cancellation
-        close()
-        raise
+    if n < _ASYNC_THRESHOLD:
+        return get_bytes(n)
+    return await run_cancellable(_get_executor(), close, get_bytes, n)
 
 
 async def get_bits_async(n: int) -> bytes:
@@ -171,12 +270,9 @@ async def get_bits_async(n: int) -> bytes:
         ValueError: If n <= 0
         asyncio.CancelledError: If operation is cancelled
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_bits, n)
-    except asyncio.CancelledError:
-        close()
-        raise
+    if n < _ASYNC_THRESHOLD * 8:
+        return get_bits(n)
+    return await run_cancellable(_get_executor(), close, get_bits, n)
 
 
 async def get_exact_bits_async(n: int) -> bytes:
@@ -192,12 +288,9 @@ async def get_exact_bits_async(n: int) -> bytes:
         ValueError: If n <= 0 or if n is not divisible by 8
         asyncio.CancelledError: If operation is cancelled
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_exact_bits, n)
-    except asyncio.CancelledError:
-        close()
-        raise
+    if n < _ASYNC_THRESHOLD * 8:
+        return get_exact_bits(n)
+    return await run_cancellable(_get_executor(), close, get_exact_bits, n)
 
 
 async def random_int_async(min_val: int = 0, max_val: int | None = None) -> int:
@@ -212,14 +305,9 @@ async def random_int_async(min_val: int = 0, max_val: int | None = None) -> int:
 
     Raises:
         ValueError: If min_val >= max_val or if min_val < 0 when max_val is None
-        asyncio.CancelledError: If operation is cancelled
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), random_int, min_val, max_val)
-    except asyncio.CancelledError:
-        close()
-        raise
+    # A single bounded draw; always cheaper than the executor hop
+    return random_int(min_val, max_val)
 
 
 async def close_async() -> None:
@@ -227,9 +315,8 @@ async def close_async() -> None:
 
     Calls sync close() and shuts down the executor.
     """
-    global _executor
     loop = asyncio.get_running_loop()
     try:
         await loop.run_in_executor(_get_executor(), close)
     finally:
-        _executor.shutdown(wait=False)
+        shutdown_executor("pseudo_rng")
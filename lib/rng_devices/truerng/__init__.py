@@ -36,6 +36,7 @@ from .core import (
     get_exact_bits,
     get_exact_bits_async,
     is_device_available,
+    iter_bytes,
     random_int,
     random_int_async,
 )
@@ -46,6 +47,7 @@ __all__ = [
     "get_bytes",
     "get_bits",
     "get_exact_bits",
+    "iter_bytes",
     "random_int",
     "close",
     # Async API
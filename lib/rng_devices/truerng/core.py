@@ -7,23 +7,30 @@ Dependencies: pyserial
 """
 
 import asyncio
-import math
 import os
+import struct
+import threading
+import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
 
 import serial
 from serial.tools import list_ports
 
-# Module-level executor for async operations (1 worker to prevent concurrent hardware access)
-_executor = ThreadPoolExecutor(max_workers=1)
+from .._executor import get_executor, run_cancellable, shutdown_executor
 
 
 def _get_executor() -> ThreadPoolExecutor:
-    """Get the executor, recreating it if it was shut down."""
-    global _executor
-    if getattr(_executor, "_shutdown", False):
-        _executor = ThreadPoolExecutor(max_workers=1)
-    return _executor
+    """Get this backend's single-worker executor from the shared registry."""
+    return get_executor("truerng")
+
+
+# Rejection-sampling candidates drawn per device read in random_int
+_RANDOM_INT_CANDIDATES = 8
+# Big-endian unpackers for the word-sized candidate widths in random_int
+_WORD_UNPACK = {
+    n: struct.Struct(f">{code}") for n, code in ((1, "B"), (2, "H"), (4, "I"), (8, "Q"))
+}
 
 
 def _is_trng_port(port) -> bool:
@@ -49,20 +56,37 @@ def _is_trng_port(port) -> bool:
         return False
 
 
+# Last port scan result and its time.monotonic() stamp; comports() walks
+# sysfs/the registry, so repeated availability polls reuse it for _PORT_TTL s
+_port_cache: tuple[str | None, float] | None = None
+_PORT_TTL = 2.0
+
+
 def _find_port() -> str | None:
     """Find the TrueRNG device port.
 
+    The result (found or not) is cached for `_PORT_TTL` seconds; dropping the
+    serial handle invalidates it.
+
     Returns:
         Port path/name if found, None otherwise
     """
-    ports = list(list_ports.comports())
-    for port in ports:
+    global _port_cache
+
+    now = time.monotonic()
+    if _port_cache is not None and now - _port_cache[1] < _PORT_TTL:
+        return _port_cache[0]
+
+    found = None
+    for port in list_ports.comports():
         if _is_trng_port(port):
             try:
-                return getattr(port, "device", None) or str(port[0])
+                found = getattr(port, "device", None) or str(port[0])
             except Exception:
-                return str(port[0])
-    return None
+                found = str(port[0])
+            break
+    _port_cache = (found, now)
+    return found
 
 
 def is_device_available() -> bool:
@@ -74,54 +98,152 @@ def is_device_available() -> bool:
     return _find_port() is not None
 
 
-def get_bytes(n: int) -> bytes:
-    """Generate n random bytes from TrueRNG device.
+# Open serial handle, reused across reads until close() or a serial error
+_cached_serial: serial.Serial | None = None
 
-    Args:
-        n: Number of bytes to generate. Must be positive.
+# close() can run on another thread (the event loop, when an async read is
+# cancelled) while a worker is blocked in read(). It never closes the port
+# under that read: it bumps _close_gen, wakes the read with cancel_read() and
+# leaves the handle for the last in-flight read to drop. A read that sees the
+# generation change fails instead of reopening the port. _state_lock guards
+# these counters and the cached handle.
+_state_lock = threading.Lock()
+_close_gen = 0
+_active_reads = 0
+_close_pending = False
 
-    Returns:
-        Random bytes from hardware device.
+
+def _reset_tty_min(ser: serial.Serial) -> None:
+    """Linux fix: reset the port's `min` setting that pyserial leaves behind.
+
+    Equivalent to `stty -F <port> min 1`, applied in-process on the open
+    handle instead of spawning stty.
+    """
+    if os.name != "posix":
+        return
+    import termios
+
+    try:
+        attrs = termios.tcgetattr(ser.fileno())
+        attrs[6][termios.VMIN] = 1
+        termios.tcsetattr(ser.fileno(), termios.TCSANOW, attrs)
+    except (termios.error, OSError):
+        pass
+
+
+def _get_serial() -> serial.Serial:
+    """Return the cached TrueRNG serial handle, opening it on first use.
 
     Raises:
-        ValueError: If n <= 0
-        RuntimeError: If device not found or read fails
+        RuntimeError: If device not found
     """
-    if n <= 0:
-        raise ValueError(f"n must be positive, got {n}")
+    global _cached_serial
+
+    if _cached_serial is not None and _cached_serial.is_open:
+        return _cached_serial
 
     port = _find_port()
     if port is None:
         raise RuntimeError("TrueRNG device not found")
 
     ser = serial.Serial(port=port, timeout=10)
-    try:
-        ser.setDTR(True)
-        ser.flushInput()
-        data = ser.read(n)
+    ser.setDTR(True)
+    _reset_tty_min(ser)
+    _cached_serial = ser
+    return ser
 
-        # Linux fix: Reset serial port min setting after pyserial usage
-        if os.name == "posix":
-            import subprocess
 
-            try:
-                subprocess.run(
-                    ["stty", "-F", port, "min", "1"], check=True, capture_output=True
-                )
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                pass
+def _drop_serial() -> None:
+    """Close and forget the cached serial handle (safe to call repeatedly).
 
-        if len(data) < n:
-            raise RuntimeError(f"Read timeout: expected {n} bytes, got {len(data)}")
+    Also forgets the cached port scan so the next lookup rescans.
+    """
+    global _cached_serial, _port_cache
 
-        return data
-    finally:
+    ser, _cached_serial = _cached_serial, None
+    _port_cache = None
+    if ser is not None:
         try:
             ser.close()
         except Exception:
             pass
 
 
+def _begin_read() -> tuple[int, serial.Serial]:
+    """Register an in-flight read; return the close generation and handle."""
+    global _active_reads
+
+    with _state_lock:
+        ser = _get_serial()
+        _active_reads += 1
+        return _close_gen, ser
+
+
+def _end_read(gen: int) -> bool:
+    """Unregister a read started at close generation `gen`.
+
+    Drops the handle if close() was deferred until reads finished.
+
+    Returns:
+        True if close() was called while the read was in flight
+    """
+    global _active_reads, _close_pending
+
+    with _state_lock:
+        _active_reads -= 1
+        if _close_pending and _active_reads == 0:
+            _close_pending = False
+            _drop_serial()
+        return gen != _close_gen
+
+
+def get_bytes(n: int) -> bytes:
+    """Generate n random bytes from TrueRNG device.
+
+    The serial port is opened on first use and kept open; a serial error
+    drops the handle and the read is retried once on a fresh one, unless
+    close() was called during the read.
+
+    Args:
+        n: Number of bytes to generate. Must be positive.
+
+    Returns:
+        Random bytes from hardware device.
+
+    Raises:
+        ValueError: If n <= 0
+        RuntimeError: If device not found or read fails
+    """
+    if n <= 0:
+        raise ValueError(f"n must be positive, got {n}")
+
+    for attempt in range(2):
+        gen, ser = _begin_read()
+        error = None
+        try:
+            # Discard output buffered since the last read so each sample is fresh
+            ser.flushInput()
+            data = ser.read(n)
+        except serial.SerialException as e:
+            error = e
+        finally:
+            closed = _end_read(gen)
+        if closed:
+            # Released on request; reopening would grab the device again
+            raise RuntimeError("TrueRNG was closed during the read")
+        if error is None:
+            break
+        with _state_lock:
+            _drop_serial()
+        if attempt:
+            raise RuntimeError(f"TrueRNG read failed: {error}")
+
+    if len(data) < n:
+        raise RuntimeError(f"Read timeout: expected {n} bytes, got {len(data)}")
+
+    return data
+
+
 def get_bits(n: int) -> bytes:
     """Generate n random bits from TrueRNG device.
 
@@ -169,6 +291,27 @@ def get_exact_bits(n: int) -> bytes:
     return get_bytes(n_bytes)
 
 
+def iter_bytes(chunk: int) -> Iterator[bytes]:
+    """Stream random bytes from TrueRNG in `chunk`-sized reads, indefinitely.
+
+    Lets long runs consume entropy with O(chunk) memory instead of one large
+    get_bytes() call. Arguments are validated by get_bytes() on the first
+    iteration.
+
+    Args:
+        chunk: Bytes per yielded chunk. Must be positive.
+
+    Yields:
+        Random byte chunks of length `chunk`.
+
+    Raises:
+        ValueError: If chunk <= 0
+        RuntimeError: If device not found or read fails
+    """
+    while True:
+        yield get_bytes(chunk)
+
+
 def _bytes_to_int(data: bytes) -> int:
     """Convert bytes to integer."""
     return int.from_bytes(data, "big")
@@ -199,28 +342,56 @@ def random_int(min_val: int = 0, max_val: int | None = None) -> int:
 
     range_size = max_val - min_val
 
-    # Calculate bits needed
-    bits_needed = max(1, math.ceil(math.log2(range_size)))
+    # Calculate bits needed (exact integer width of the largest offset)
+    bits_needed = max(1, (range_size - 1).bit_length())
     n_bytes = (bits_needed + 7) // 8
 
-    # Use rejection sampling for uniform distribution
+    mask = (1 << bits_needed) - 1
+    if range_size & mask == 0:
+        # Power-of-two range: every masked sample is in range, no rejection
+        return min_val + (_bytes_to_int(get_bytes(n_bytes)) & mask)
+    # Rejection sampling for uniform distribution. Each candidate is accepted
+    # with p >= 1/2, so drawing a batch per device read makes a second read
+    # unlikely (p <= 1/256)
+    batch = n_bytes * _RANDOM_INT_CANDIDATES
+    unpack = _WORD_UNPACK.get(n_bytes)
     while True:
-        data = get_bytes(n_bytes)
-        val = _bytes_to_int(data)
-        # Mask off extra bits to get exactly bits_needed bits
-        val &= (1 << bits_needed) - 1
-        if val < range_size:
-            return min_val + val
+        data = get_bytes(batch)
+        if unpack is not None:
+            candidates = (word for (word,) in unpack.iter_unpack(data))
+        else:
+            candidates = (
+                _bytes_to_int(data[j : j + n_bytes]) for j in range(0, batch, n_bytes)
+            )
+        for val in candidates:
+            # Mask off extra bits to get exactly bits_needed bits
+            val &= mask
+            if val < range_size:
+                return min_val + val
 
 
 def close() -> None:
     """Close and release any resources.
 
-    For truerng, connections are closed after each read.
-    This function is a no-op for sync operations.
-    Use close_async() to properly shut down async executor.
+    Closes the cached serial port; the next read reopens it. If a read is in
+    progress on another thread, it is woken and fails, and that thread closes
+    the port. Safe to call multiple times and from any thread. Use
+    close_async() to also shut down the async executor.
     """
-    pass
+    global _close_gen, _close_pending
+
+    with _state_lock:
+        _close_gen += 1
+        if _active_reads == 0:
+            _drop_serial()
+            return
+        _close_pending = True
+        ser = _cached_serial
+        if ser is not None:
+            try:
+                ser.cancel_read()
+            except Exception:
+                pass
 
 
 # Async versions of all functions
@@ -243,13 +414,7 @@ async def get_bytes_async(n: int) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RuntimeError: If device not found or read fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_bytes, n)
-    except asyncio.CancelledError:
-        # Cleanup on cancellation
-        close()
-        raise
+    return await run_cancellable(_get_executor(), close, get_bytes, n)
 
 
 async def get_bits_async(n: int) -> bytes:
@@ -266,12 +431,7 @@ async def get_bits_async(n: int) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RuntimeError: If device not found or read fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_bits, n)
-    except asyncio.CancelledError:
-        close()
-        raise
+    return await run_cancellable(_get_executor(), close, get_bits, n)
 
 
 async def get_exact_bits_async(n: int) -> bytes:
@@ -288,12 +448,7 @@ async def get_exact_bits_async(n: int) -> bytes:
         asyncio.CancelledError: If operation is cancelled
         RuntimeError: If device not found or read fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), get_exact_bits, n)
-    except asyncio.CancelledError:
-        close()
-        raise
+    return await run_cancellable(_get_executor(), close, get_exact_bits, n)
 
 
 async def random_int_async(min_val: int = 0, max_val: int | None = None) -> int:
@@ -311,12 +466,7 @@ async def random_int_async(min_val: int = 0, max_val: int | None = None) -> int:
         asyncio.CancelledError: If operation is cancelled
         RuntimeError: If device not found or read fails
     """
-    loop = asyncio.get_running_loop()
-    try:
-        return await loop.run_in_executor(_get_executor(), random_int, min_val, max_val)
-    except asyncio.CancelledError:
-        close()
-        raise
+    return await run_cancellable(_get_executor(), close, random_int, min_val, max_val)
 
 
 async def close_async() -> None:
@@ -324,9 +474,8 @@ async def close_async() -> None:
 
     Calls sync close() and shuts down the executor.
     """
-    global _executor
     loop = asyncio.get_running_loop()
     try:
         await loop.run_in_executor(_get_executor(), close)
     finally:
-        _executor.shutdown(wait=False)
+        shutdown_executor("truerng")
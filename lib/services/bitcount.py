@@ -0,0 +1,98 @@
+"""Popcount helpers shared by the collector and analysis paths.
+
+`popcount_bytes` counts the '1' bits in a byte buffer, choosing between
+Python's big-int `bit_count()` and NumPy's vectorized per-byte popcount
+depending on the buffer size. `popcount_blocks` counts per fixed-size block.
+"""
+
+import numpy as np
+
+# Below this many bytes a single int.from_bytes().bit_count() beats the NumPy
+# call overhead; above it the vectorized popcount wins (~4x at 64 KiB)
+_INT_POPCOUNT_MAX_BYTES = 2048
+
+# Wilkes-Wheeler-Gill SWAR masks: sum bit pairs, nibbles, bytes, then gather
+# the byte sums into the top byte with one multiply
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def _swar_u64(x: np.ndarray) -> np.ndarray:
+    """Per-word popcount of a uint64 array via SWAR (no np.bitwise_count)."""
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return (x * _H01) >> np.uint64(56)
+
+
+if hasattr(np, "bitwise_count"):
+
+    def _popcount_np(arr: np.ndarray, out: np.ndarray | None) -> int:
+        # Counting whole words is ~2.5x faster than per byte
+        if arr.size % 8 == 0:
+            arr = arr.view(np.uint64)
+            if out is not None:
+                out = out[: arr.size]
+        return int(np.bitwise_count(arr, out=out).sum(dtype=np.uint64))
+
+    def _popcount_rows(rows: np.ndarray) -> np.ndarray:
+        # Whole-word popcount when the row width allows a uint64 view
+        if rows.shape[1] % 8 == 0:
+            rows = rows.view(np.uint64)
+        return np.bitwise_count(rows).sum(axis=1, dtype=np.int64)
+
+else:
+    # NumPy < 2.0 (no np.bitwise_count): SWAR on whole words, else a per-byte
+    # popcount table (~3x slower than SWAR)
+    _POPCOUNT_LUT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount_np(arr: np.ndarray, out: np.ndarray | None) -> int:
+        if arr.size % 8 == 0:
+            return int(_swar_u64(arr.view(np.uint64)).sum(dtype=np.uint64))
+        return int(np.take(_POPCOUNT_LUT, arr, out=out).sum(dtype=np.uint64))
+
+    def _popcount_rows(rows: np.ndarray) -> np.ndarray:
+        if rows.shape[1] % 8 == 0:
+            return _swar_u64(rows.view(np.uint64)).sum(axis=1, dtype=np.int64)
+        return np.take(_POPCOUNT_LUT, rows).sum(axis=1, dtype=np.int64)
+
+
+def popcount_bytes(data: bytes, out: np.ndarray | None = None) -> int:
+    """Count '1' bits in `data`.
+
+    Args:
+        data: Bytes-like buffer to count
+        out: Optional uint8 scratch array of len(data) for the per-byte (or
+            per-word) counts on the NumPy path; ignored if its size does not
+            match
+
+    Returns:
+        Number of set bits
+    """
+    if len(data) <= _INT_POPCOUNT_MAX_BYTES:
+        return int.from_bytes(data, "little").bit_count()
+    arr = np.frombuffer(data, dtype=np.uint8)
+    if out is not None and out.size != arr.size:
+        out = None
+    return _popcount_np(arr, out)
+
+
+def popcount_blocks(data: np.ndarray, block_bytes: int) -> np.ndarray:
+    """Count '1' bits in each consecutive `block_bytes`-sized block of `data`.
+
+    Args:
+        data: 1-D uint8 array
+        block_bytes: Block size in bytes (positive)
+
+    Returns:
+        int64 array with one count per block; a trailing partial block is
+        counted as its own (shorter) block
+    """
+    n_full = data.size // block_bytes
+    counts = _popcount_rows(data[: n_full * block_bytes].reshape(n_full, block_bytes))
+    tail = data[n_full * block_bytes :]
+    if tail.size:
+        counts = np.append(counts, _popcount_np(tail, None))
+    return counts
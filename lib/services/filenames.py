@@ -1,5 +1,9 @@
 import re
 from datetime import datetime
+from functools import lru_cache
+
+_BITS_RE = re.compile(r"_s(\d+)_")
+_INTERVAL_RE = re.compile(r"_i(\d+)")
 
 
 def format_capture_name(
@@ -25,15 +29,17 @@ def format_capture_name(
     return name
 
 
+@lru_cache(maxsize=256)
 def parse_bits(name: str) -> int:
-    m = re.search(r"_s(\d+)_", name)
+    m = _BITS_RE.search(name)
     if not m:
         raise ValueError("bits not found in name")
     return int(m.group(1))
 
 
+@lru_cache(maxsize=256)
 def parse_interval(name: str) -> int:
-    m = re.search(r"_i(\d+)", name)
+    m = _INTERVAL_RE.search(name)
     if not m:
         raise ValueError("interval not found in name")
     return int(m.group(1))
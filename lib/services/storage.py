@@ -1,12 +1,77 @@
-import csv
 import os
+import shutil
 from collections.abc import Iterable
 from contextlib import ExitStack
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
-from bitstring import BitArray  # type: ignore
+
+from .bitcount import popcount_blocks
+
+# Buffer size for raw file-to-file copies
+_COPY_CHUNK = 1 << 20
+# Bytes of a binary capture counted per pass in read_bin_counts
+_BIN_TILE_BYTES = 4 << 20
+
+
+class CountWriter:
+    """Append (timestamp, count) rows to a capture CSV, keeping the file open.
+
+    The file is opened on the first write and kept until `close()`, so a
+    capture pays for one open instead of one per batch. Every `write_rows`
+    call is flushed, so rows reach disk as promptly as a per-call open did.
+
+    Args:
+        filename_stem: Base filename without extension
+    """
+
+    def __init__(self, filename_stem: str) -> None:
+        self.path = f"{filename_stem}.csv"
+        self._fh = None
+        # Last formatted whole second; strftime costs ~5 us, so rows that share
+        # a second (sub-second sample intervals) reuse the string
+        self._last_second: datetime | None = None
+        self._last_stamp = ""
+
+    def _stamp(self, ts: datetime) -> str:
+        second = ts.replace(microsecond=0)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_stamp = f"{second:%Y%m%dT%H%M%S}"
+        return self._last_stamp
+
+    def write_rows(self, rows: Iterable[tuple[datetime, int]]) -> None:
+        """Append rows to the CSV in one write.
+
+        Args:
+            rows: Iterable of (timestamp, count) pairs, in capture order
+
+        Raises:
+            RuntimeError: If the file cannot be opened or written
+        """
+        try:
+            if self._fh is None:
+                self._fh = open(self.path, "a", newline="", buffering=1 << 16)
+            # Fixed two-column schema; same "\r\n" rows csv.writer produced
+            self._fh.write(
+                "".join(f"{self._stamp(ts)},{count}\r\n" for ts, count in rows)
+            )
+            self._fh.flush()
+        except OSError as e:
+            raise RuntimeError(f"Failed to write CSV counts: {e}")
+
+    def close(self) -> None:
+        """Close the file if it was opened."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> "CountWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 def write_csv_count(count: int, filename_stem: str) -> None:
@@ -16,13 +81,18 @@ def write_csv_count(count: int, filename_stem: str) -> None:
         count: Number of '1' bits counted
         filename_stem: Base filename without extension
     """
-    now = datetime.now().strftime("%Y%m%dT%H%M%S")
-    path = f"{filename_stem}.csv"
-    try:
-        with open(path, "a", newline="") as f:
-            csv.writer(f).writerow([now, count])
-    except OSError as e:
-        raise RuntimeError(f"Failed to write CSV count: {e}")
+    write_csv_counts([(datetime.now(), count)], filename_stem)
+
+
+def write_csv_counts(rows: Iterable[tuple[datetime, int]], filename_stem: str) -> None:
+    """Append several count entries to a CSV file with a single open/write.
+
+    Args:
+        rows: Iterable of (timestamp, count) pairs, in capture order
+        filename_stem: Base filename without extension
+    """
+    with CountWriter(filename_stem) as writer:
+        writer.write_rows(rows)
 
 
 def read_bin_counts(file_path: str, block_bits: int) -> pd.DataFrame:
@@ -42,21 +112,64 @@ def read_bin_counts(file_path: str, block_bits: int) -> pd.DataFrame:
     if block_bits <= 0 or (block_bits % 8) != 0:
         raise ValueError("block_bits must be positive and divisible by 8")
 
-    data_list: list[list[int]] = []
+    block_bytes = block_bits // 8
     try:
-        with open(file_path, "rb") as binary_file:
-            block = 1
-            while True:
-                data = binary_file.read(block_bits // 8)
-                if not data:
-                    break
-                ones = BitArray(data).count(1)
-                data_list.append([block, ones])
-                block += 1
+        size = os.path.getsize(file_path)
+        # Map the file rather than reading it, so memory use does not grow with
+        # the capture size (mmap rejects empty files)
+        data = (
+            np.memmap(file_path, dtype=np.uint8, mode="r")
+            if size
+            else np.empty(0, dtype=np.uint8)
+        )
     except OSError as e:
         raise RuntimeError(f"Failed to read binary file: {e}")
 
-    return pd.DataFrame(data_list, columns=["samples", "ones"])
+    # Count in tiles of whole blocks so each pass stays cache-resident
+    tile = max(1, _BIN_TILE_BYTES // block_bytes) * block_bytes
+    ones = np.empty(-(-size // block_bytes), dtype=np.int64)
+    for start in range(0, size, tile):
+        counts = popcount_blocks(data[start : start + tile], block_bytes)
+        first = start // block_bytes
+        ones[first : first + counts.size] = counts
+    del data
+    # Both columns are fresh arrays owned here, so let pandas adopt them as-is
+    return pd.DataFrame(
+        {"samples": np.arange(1, ones.size + 1), "ones": ones}, copy=False
+    )
+
+
+# Character positions of HH, MM, SS in a "YYYYMMDDTHHMMSS" capture timestamp
+# and where they go in "HH:MM:SS"
+_TS_TIME_CHARS = [9, 10, 11, 12, 13, 14]
+_HHMMSS_SLOTS = [0, 1, 3, 4, 6, 7]
+
+
+def _capture_times_to_hhmmss(times: np.ndarray) -> np.ndarray:
+    """Turn "YYYYMMDDTHHMMSS" strings into "HH:MM:SS" by byte slicing.
+
+    Args:
+        times: Array of capture timestamp strings
+
+    Returns:
+        Object array of "HH:MM:SS" strings
+
+    Raises:
+        ValueError: If any timestamp is not in the capture format
+    """
+    try:
+        raw = times.astype("S")
+    except UnicodeEncodeError:
+        raise ValueError("timestamps must be YYYYMMDDTHHMMSS")
+    if raw.dtype.itemsize != 15:
+        raise ValueError("timestamps must be YYYYMMDDTHHMMSS")
+    chars = raw.view("S1").reshape(-1, 15)
+    hms = chars[:, _TS_TIME_CHARS]
+    if not ((chars[:, 8] == b"T").all() and ((hms >= b"0") & (hms <= b"9")).all()):
+        raise ValueError("timestamps must be YYYYMMDDTHHMMSS")
+    out = np.full((len(raw), 8), b":", dtype="S1")
+    out[:, _HHMMSS_SLOTS] = hms
+    return out.view("S8").ravel().astype(str).astype(object)
 
 
 def read_csv_counts(file_path: str) -> pd.DataFrame:
@@ -69,10 +182,19 @@ def read_csv_counts(file_path: str) -> pd.DataFrame:
         DataFrame with columns ['time', 'ones'] where time is formatted as HH:MM:SS
     """
     try:
-        df = pd.read_csv(file_path, header=None, names=["time", "ones"])
-        df["time"] = pd.to_datetime(df["time"]).dt.strftime("%H:%M:%S")
+        # Typed, fixed-column parse: no dtype inference or object fallback
+        df = pd.read_csv(
+            file_path,
+            header=None,
+            names=["time", "ones"],
+            usecols=[0, 1],
+            dtype={"time": str, "ones": np.int32},
+        )
+        # Only the display string is needed: slice it out of the writer's
+        # fixed-width timestamp rather than parsing and re-formatting dates
+        df["time"] = _capture_times_to_hhmmss(df["time"].to_numpy())
         return df
-    except (OSError, pd.errors.EmptyDataError) as e:
+    except (OSError, ValueError, pd.errors.EmptyDataError) as e:
         raise RuntimeError(f"Failed to read CSV file: {e}")
 
 
@@ -94,13 +216,33 @@ def add_zscore(df: pd.DataFrame, block_bits: int) -> pd.DataFrame:
 
     expected_mean = 0.5 * block_bits
     expected_std_dev = np.sqrt(block_bits * 0.5 * 0.5)
-    df["cumulative_mean"] = df["ones"].expanding().mean()
-    df["z_test"] = (df["cumulative_mean"] - expected_mean) / (
-        expected_std_dev / np.sqrt(df.index + 1)
-    )
+    # Cumulative mean and Z-score in one NumPy pass over the counts
+    ones = df["ones"].to_numpy(dtype=np.float64)
+    counts = np.arange(1, ones.size + 1, dtype=np.float64)
+    cum_mean = ones.cumsum() / counts
+    df["cumulative_mean"] = cum_mean
+    # (mean - mu) * sqrt(n) / sd, built in place to avoid extra temporaries
+    z = cum_mean - expected_mean
+    z *= np.sqrt(counts)
+    z *= 1.0 / expected_std_dev
+    df["z_test"] = z
     return df
 
 
+def _write_frame_rows(workbook, worksheet, df: pd.DataFrame) -> None:
+    """Write `df` (header plus rows, no index) to `worksheet` in row order.
+
+    Rows are written sequentially from plain Python values, which is what
+    xlsxwriter's constant_memory mode needs to flush each row as it goes.
+    The header is bold and boxed, as pandas' to_excel writes it.
+    """
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center"})
+    worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+    columns = [df[c].tolist() for c in df.columns]
+    for row, values in enumerate(zip(*columns), start=1):
+        worksheet.write_row(row, 0, values)
+
+
 def write_excel_with_chart(
     df: pd.DataFrame, file_path: str, block_bits: int, interval: int
 ) -> str:
@@ -124,10 +266,12 @@ def write_excel_with_chart(
 
     out_path = os.path.splitext(file_path)[0] + ".xlsx"
     try:
-        writer = pd.ExcelWriter(out_path, engine="xlsxwriter")
-        df.to_excel(writer, sheet_name="Zscore", index=False)
-        workbook = writer.book
-        worksheet = writer.sheets["Zscore"]
+        import xlsxwriter
+
+        # Stream rows to disk instead of holding the whole sheet in memory
+        workbook = xlsxwriter.Workbook(out_path, {"constant_memory": True})
+        worksheet = workbook.add_worksheet("Zscore")
+        _write_frame_rows(workbook, worksheet, df)
 
         if file_path.endswith(".csv"):
             time_format = workbook.add_format({"num_format": "hh:mm:ss"})
@@ -150,7 +294,7 @@ def write_excel_with_chart(
         chart.set_y_axis({"name": f"Z-Score - Sample Size = {block_bits} bits"})
         chart.set_legend({"none": True})
         worksheet.insert_chart("F2", chart)
-        writer.close()
+        workbook.close()
         return out_path
     except Exception as e:
         raise RuntimeError(f"Failed to create Excel file: {e}")
@@ -177,11 +321,11 @@ def concat_csv_files(all_filenames: Iterable[str], out_stem: str) -> str:
     out_path = os.path.join(os.path.dirname(filenames_list[0]), f"{out_stem}.csv")
     try:
         with ExitStack() as stack:
-            files = [stack.enter_context(open(fname)) for fname in filenames_list]
-            with open(out_path, "a") as out:
+            files = [stack.enter_context(open(fname, "rb")) for fname in filenames_list]
+            with open(out_path, "ab") as out:
                 for f in files:
-                    for line in f:
-                        out.write(line)
+                    # Raw byte copy in 1 MiB chunks; no per-line decode/write
+                    shutil.copyfileobj(f, out, _COPY_CHUNK)
         return out_path
     except OSError as e:
         raise RuntimeError(f"Failed to concatenate CSV files: {e}")
@@ -207,7 +351,7 @@ def write_enhanced_excel(
         RuntimeError: If Excel file cannot be created
     """
     try:
-        import xlsxwriter  # noqa: F401
+        import xlsxwriter
     except ImportError:
         raise RuntimeError("xlsxwriter package is required for Excel export")
 
@@ -218,14 +362,13 @@ def write_enhanced_excel(
     base_name = os.path.basename(file_path)
     out_path = os.path.join("data/processed", os.path.splitext(base_name)[0] + ".xlsx")
 
-    writer = pd.ExcelWriter(out_path, engine="xlsxwriter")
+    # Stream rows to disk instead of holding the whole sheet in memory
+    workbook = xlsxwriter.Workbook(out_path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet("Analysis")
 
     # Write all columns to Excel
     df_export = df[["time", "ones", "cumulative_mean", "z_test", "p_value"]]
-    df_export.to_excel(writer, sheet_name="Analysis", index=False)
-
-    workbook = writer.book
-    worksheet = writer.sheets["Analysis"]
+    _write_frame_rows(workbook, worksheet, df_export)
 
     # Format time column
     time_format = workbook.add_format({"num_format": "hh:mm:ss"})
@@ -275,5 +418,5 @@ def write_enhanced_excel(
         else:
             stats_worksheet.write(row_idx, 1, value)
 
-    writer.close()
+    workbook.close()
     return out_path
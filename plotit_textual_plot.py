@@ -1,37 +1,38 @@
 from textual.app import App, ComposeResult
 from textual.timer import Timer
 from textual_plot import PlotWidget
-import math
-import random
+import numpy as np
+
+WINDOW = 50
 
 
 class LivePlotApp(App[None]):
     def __init__(self) -> None:
         super().__init__()
-        self.x_data: list[float] = []
-        self.y_data: list[float] = []
+        self._rng = np.random.default_rng()
+        # Fixed-size sliding window, shifted in place each tick
+        self.x_data = np.arange(WINDOW, dtype=np.float64)
+        self.y_data = np.sin(self.x_data / 5) + self._rng.uniform(-0.2, 0.2, WINDOW)
         self.timer: Timer | None = None
+        self._plot: PlotWidget | None = None
 
     def compose(self) -> ComposeResult:
         yield PlotWidget()
 
     def on_mount(self) -> None:
-        self.x_data = list(range(50))
-        self.y_data = [math.sin(x / 5) + random.uniform(-0.2, 0.2) for x in range(50)]
-
+        self._plot = self.query_one(PlotWidget)
         self.timer = self.set_interval(0.1, self.update_plot)
 
     def update_plot(self) -> None:
-        self.x_data.append(self.x_data[-1] + 1)
-        new_y = math.sin(self.x_data[-1] / 5) + random.uniform(-0.2, 0.2)
-        self.y_data.append(new_y)
-
-        if len(self.x_data) > 50:
-            self.x_data = self.x_data[-50:]
-            self.y_data = self.y_data[-50:]
-
-        plot = self.query_one(PlotWidget)
-        plot.plot(self.x_data, self.y_data)
+        x_next = self.x_data[-1] + 1
+        self.x_data[:-1] = self.x_data[1:]
+        self.y_data[:-1] = self.y_data[1:]
+        self.x_data[-1] = x_next
+        self.y_data[-1] = np.sin(x_next / 5) + self._rng.uniform(-0.2, 0.2)
+
+        # plot() copies the arrays and adds a dataset; clear the previous frame
+        self._plot.clear()
+        self._plot.plot(self.x_data, self.y_data)
 
 
 if __name__ == "__main__":
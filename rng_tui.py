@@ -7,8 +7,21 @@ Usage:
     uv run python rng_tui.py
 """
 
+import asyncio
+
 from app.main import RNGCollectorApp
 
+
+def _install_uvloop() -> None:
+    """Use uvloop's event loop when available (optional, Linux/macOS only)."""
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 if __name__ == "__main__":
+    _install_uvloop()
     app = RNGCollectorApp()
     app.run()
@@ -17,31 +17,49 @@ def pytest_configure(config):
     )
 
 
+def _probe_device(device_name: str) -> str | None:
+    """Return why `device_name` is unusable, or None if it is available."""
+    # Import the device module dynamically
+    try:
+        if device_name == "pseudo_rng":
+            from lib.rng_devices.pseudo_rng import is_device_available
+        elif device_name == "truerng":
+            from lib.rng_devices.truerng import is_device_available
+        elif device_name == "bitbabbler_rng":
+            from lib.rng_devices.bitbabbler_rng import is_device_available
+        elif device_name == "intel_seed":
+            from lib.rng_devices.intel_seed import is_device_available
+        else:
+            pytest.fail(f"Unknown device: {device_name}")
+    except ImportError as e:
+        return f"Failed to import {device_name}: {e}"
+
+    if not is_device_available():
+        return f"{device_name} hardware not connected or not available"
+    return None
+
+
+@pytest.fixture(scope="session")
+def device_skip_reasons():
+    """Per-session cache of `_probe_device` results, keyed by device name."""
+    return {}
+
+
 @pytest.fixture
-def skip_if_no_device(request):
-    """Skip test if required hardware device is not available."""
+def skip_if_no_device(request, device_skip_reasons):
+    """Skip test if required hardware device is not available.
+
+    Each device is probed once per session; later tests reuse the result
+    instead of re-enumerating USB/serial devices.
+    """
     marker = request.node.get_closest_marker("hardware")
     if marker:
         device_name = marker.args[0]
-
-        # Import the device module dynamically
-        try:
-            if device_name == "pseudo_rng":
-                from lib.rng_devices.pseudo_rng import is_device_available
-            elif device_name == "truerng":
-                from lib.rng_devices.truerng import is_device_available
-            elif device_name == "bitbabbler_rng":
-                from lib.rng_devices.bitbabbler_rng import is_device_available
-            elif device_name == "intel_seed":
-                from lib.rng_devices.intel_seed import is_device_available
-            else:
-                pytest.fail(f"Unknown device: {device_name}")
-
-            if not is_device_available():
-                pytest.skip(f"{device_name} hardware not connected or not available")
-
-        except ImportError as e:
-            pytest.skip(f"Failed to import {device_name}: {e}")
+        if device_name not in device_skip_reasons:
+            device_skip_reasons[device_name] = _probe_device(device_name)
+        reason = device_skip_reasons[device_name]
+        if reason is not None:
+            pytest.skip(reason)
 
 
 @pytest.fixture
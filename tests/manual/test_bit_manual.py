@@ -5,6 +5,7 @@ from lib.rng_devices.bitbabbler_rng import (
     get_exact_bits,
     is_device_available,
 )
+from lib.services.bitcount import popcount_bytes
 
 t0 = time.time()
 # Check if device is connected
@@ -20,7 +21,7 @@ if is_device_available():
 
     # Generate 1000 bits for statistical analysis
     data = get_exact_bits(80, folds=1)  # Exactly 1000 bits with whitening
-    ones = sum(bin(b).count("1") for b in data)
+    ones = popcount_bytes(data)
     zeros = len(data) * 8 - ones
     print("data", data)
     print(ones)
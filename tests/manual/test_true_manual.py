@@ -6,6 +6,7 @@ from lib.rng_devices.truerng import (
     get_exact_bits,
     is_device_available,
 )
+from lib.services.bitcount import popcount_bytes
 
 # Check if device is connected
 if is_device_available():
@@ -23,7 +24,7 @@ if is_device_available():
     print(data2)
 
     # Count ones for statistical analysis
-    ones = sum(bin(b).count("1") for b in data2)
+    ones = popcount_bytes(data2)
     zeros = len(data2) * 8 - ones
     print(ones)
     print(zeros)
@@ -0,0 +1,40 @@
+"""
+Tests for the RNG collector app (headless, pseudo_rng only).
+"""
+
+import asyncio
+import time
+
+from textual.widgets import Input
+
+from app.main import RNGCollectorApp
+
+
+class TestQuitDuringCollection:
+    """Test that quitting mid-run keeps every collected sample."""
+
+    def test_quit_flushes_pending_rows(self, tmp_path, monkeypatch):
+        """Test that rows still batched in the CSV writer reach disk on quit."""
+        (tmp_path / "data" / "raw").mkdir(parents=True)
+        monkeypatch.chdir(tmp_path)
+
+        async def run() -> tuple[int, str]:
+            app = RNGCollectorApp()
+            async with app.run_test() as pilot:
+                app.query_one("#freq_input", Input).value = "0.05"
+                app.query_one("#duration_input", Input).value = "0"
+                await app.action_start()
+                output_file = app.output_file
+                # Fewer samples than one batch, so none are on disk yet
+                deadline = time.monotonic() + 10
+                while app.sample_count < 5 and time.monotonic() < deadline:
+                    await pilot.pause(0.05)
+                await app.action_quit()
+                return app.sample_count, output_file
+
+        sample_count, output_file = asyncio.run(run())
+
+        assert 0 < sample_count < 32
+        with open(output_file) as f:
+            rows = f.read().splitlines()
+        assert len(rows) == sample_count
@@ -1,19 +1,419 @@
 """
 Tests for bitbabbler_rng (BitBabbler hardware RNG).
 
-These tests will be skipped if BitBabbler hardware is not connected.
+These tests will be skipped if BitBabbler hardware is not connected, except
+the software-only XOR folding tests.
 """
 
+import array
+import os
+import random
+from types import SimpleNamespace
+
 import pytest
 
 from lib.rng_devices.bitbabbler_rng import (
+    bitbabbler,
     close,
+    core,
+    ftdi,
     get_bits,
     get_bytes,
     get_exact_bits,
     is_device_available,
+    iter_bytes,
     random_int,
 )
+from lib.rng_devices.bitbabbler_rng.bitbabbler import (
+    BitBabbler,
+    fold_bytes,
+    real_bitrate,
+)
+from lib.rng_devices.bitbabbler_rng.ftdi import FTDIDevice
+
+
+def _fold_reference(data: bytes, folds: int) -> bytes:
+    """Reference byte-by-byte XOR fold (original pure-Python algorithm)."""
+    b = bytearray(data)
+    length = len(b)
+    for _ in range(folds):
+        half = length // 2
+        for i in range(half):
+            b[i] ^= b[half + i]
+        length = half
+    return bytes(b[:length])
+
+
+class TestFoldBytes:
+    """Test XOR folding (no hardware required)."""
+
+    @pytest.mark.parametrize("size", [2, 16, 24, 96, 1024, 65536])
+    @pytest.mark.parametrize("folds", [0, 1, 2, 3, 4])
+    def test_matches_reference(self, size, folds):
+        """Test that fold_bytes matches the reference fold for aligned sizes."""
+        if size % (1 << folds):
+            pytest.skip("size not divisible by 2**folds")
+        data = os.urandom(size)
+        result = fold_bytes(data, folds)
+        assert isinstance(result, bytes)
+        assert len(result) == size >> folds
+        assert result == _fold_reference(data, folds)
+
+    def test_known_values(self):
+        """Test folding against hand-computed XOR values."""
+        assert fold_bytes(b"\x0f\xf0", 1) == b"\xff"
+        assert fold_bytes(b"\xaa\xaa\x55\x55", 1) == b"\xff\xff"
+        assert fold_bytes(b"\x01\x02\x04\x08", 2) == b"\x0f"
+
+    def test_misaligned_length_raises(self):
+        """Test that lengths not divisible by 2**folds are rejected."""
+        with pytest.raises(ValueError, match="not divisible"):
+            fold_bytes(b"\x00" * 6, 2)
+
+
+def _strip_reference(data: bytes, plen: int) -> bytes:
+    """Reference FTDI status stripping (original per-packet loop)."""
+    out = bytearray()
+    for i in range(0, len(data), plen):
+        chunk = data[i : i + plen]
+        if len(chunk) < 2:
+            break
+        out.extend(chunk[2:])
+    return bytes(out)
+
+
+class TestStripStatus:
+    """Test FTDI packet status stripping (no hardware required)."""
+
+    @pytest.mark.parametrize("plen", [64, 512])
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 512, 1000, 4096, 4097, 65536])
+    def test_matches_reference(self, plen, size):
+        """Test full, short and ragged tail packets against the reference."""
+        dev = FTDIDevice(None, 0x81, 0x02, plen)
+        data = os.urandom(size)
+        assert dev._consume_packets_strip_status(data) == _strip_reference(data, plen)
+
+
+class _FakeUSBDevice:
+    """Bulk IN endpoint serving a payload stream in FTDI status-prefixed packets."""
+
+    def __init__(self, payload: bytes, plen: int) -> None:
+        self.payload = payload
+        self.plen = plen
+        self.pos = 0
+        self.reads: list[int] = []
+
+    def read(self, ep: int, buf: array.array, timeout: int) -> int:
+        # Mirrors PyUSB: fill the caller's buffer in place, return the count
+        size = len(buf)
+        self.reads.append(size)
+        out = bytearray()
+        while len(out) + self.plen <= size and self.pos < len(self.payload):
+            chunk = self.payload[self.pos : self.pos + self.plen - 2]
+            self.pos += len(chunk)
+            out += b"\x32\x60" + chunk
+        buf[: len(out)] = array.array("B", out)
+        return len(out)
+
+
+class TestReadData:
+    """Test FTDI bulk reads against a fake USB endpoint (no hardware required)."""
+
+    @pytest.mark.parametrize("nbytes", [1, 510, 511, 4096, 65536])
+    def test_single_transfer_and_content(self, nbytes):
+        """Test that a read needs one transfer and returns the payload in order."""
+        payload = os.urandom(nbytes)
+        usb_dev = _FakeUSBDevice(payload, 512)
+        dev = FTDIDevice(usb_dev, 0x81, 0x02, 512)
+        assert dev.read_data(nbytes) == payload
+        assert len(usb_dev.reads) == 1
+
+    def test_leftover_is_buffered(self):
+        """Test that payload beyond the request is kept for the next read."""
+        payload = os.urandom(2040)
+        usb_dev = _FakeUSBDevice(payload, 512)
+        dev = FTDIDevice(usb_dev, 0x81, 0x02, 512)
+        assert dev.read_data(1000) + dev.read_data(1040) == payload
+
+
+class _ShortTransferUSBDevice(_FakeUSBDevice):
+    """Bulk IN endpoint that fills only a random number of packets per read."""
+
+    def __init__(self, payload: bytes, plen: int, seed: int = 0) -> None:
+        super().__init__(payload, plen)
+        self._rng = random.Random(seed)
+
+    def read(self, ep: int, buf: array.array, timeout: int) -> int:
+        packets = self._rng.randint(1, len(buf) // self.plen)
+        n = super().read(ep, memoryview(buf)[: packets * self.plen], timeout)
+        self.reads[-1] = len(buf)
+        return n
+
+
+class TestReadBufferCache:
+    """Test that short transfers do not grow the bulk IN buffer cache."""
+
+    def test_partial_reads_stay_bounded(self):
+        """Test many partial reads keep at most _READ_BUF_SLOTS buffers."""
+        payload = os.urandom(200 * 16384)
+        usb_dev = _ShortTransferUSBDevice(payload, 512)
+        dev = FTDIDevice(usb_dev, 0x81, 0x02, 512)
+        out = b"".join(dev.read_data(16384) for _ in range(200))
+
+        assert out == payload
+        assert len(set(usb_dev.reads)) > ftdi._READ_BUF_SLOTS
+        assert len(dev._read_bufs) <= ftdi._READ_BUF_SLOTS
+
+
+class TestUSBStringCache:
+    """Test discovery string descriptor caching (no hardware required)."""
+
+    def test_strings_read_once_per_device(self, monkeypatch):
+        """Test that repeat lookups skip the control transfer."""
+        calls = []
+
+        def fake_get_string(dev, index):
+            calls.append((dev.address, index))
+            return f"str{index}"
+
+        dev = SimpleNamespace(bus=1, address=7, idVendor=0x0403, idProduct=0x7840)
+
+        monkeypatch.setattr(ftdi.usb.util, "get_string", fake_get_string)
+        monkeypatch.setattr(ftdi, "_usb_string_cache", {})
+        for _ in range(3):
+            assert ftdi._get_usb_string(dev, 2) == "str2"
+        assert calls == [(7, 2)]
+
+        # A replugged device (new address) is read again
+        dev.address = 8
+        assert ftdi._get_usb_string(dev, 2) == "str2"
+        assert calls == [(7, 2), (8, 2)]
+
+
+class TestFindAnyBitBabbler:
+    """Test single-walk BitBabbler discovery order (no hardware required)."""
+
+    @staticmethod
+    def _scan(monkeypatch, devices, **kwargs):
+        strings = {
+            (d.address, i): text for d in devices for i, text in d.strings.items()
+        }
+        monkeypatch.setattr(ftdi, "_usb_string_cache", {})
+        monkeypatch.setattr(
+            ftdi.usb.util, "get_string", lambda d, i: strings[(d.address, i)]
+        )
+        monkeypatch.setattr(ftdi.usb.core, "find", lambda **kw: iter(devices))
+        monkeypatch.setattr(FTDIDevice, "_open_usb_device", staticmethod(lambda d: d))
+        return FTDIDevice.find_any_bitbabbler(**kwargs)
+
+    @staticmethod
+    def _dev(address, pid, product, serial="S1"):
+        return SimpleNamespace(
+            bus=1,
+            address=address,
+            idVendor=0x0403,
+            idProduct=pid,
+            iManufacturer=0,
+            iProduct=2,
+            iSerialNumber=3,
+            strings={2: product, 3: serial},
+        )
+
+    def test_preferred_pid_beats_earlier_string_match(self, monkeypatch):
+        """Test that the canonical PID wins even when scanned later."""
+        by_string = self._dev(1, 0x6014, "BitBabbler White")
+        canonical = self._dev(2, 0x7840, "FT232H")
+        found = self._scan(monkeypatch, [by_string, canonical], product_id=0x7840)
+        assert found is canonical
+
+    def test_string_fallback_and_serial(self, monkeypatch):
+        """Test string matching, other FTDI chips skipped, serial filtering."""
+        other = self._dev(1, 0x6001, "FT232R USB UART")
+        first = self._dev(2, 0x6014, "BitBabbler Black", serial="A")
+        second = self._dev(3, 0x6014, "BitBabbler White", serial="B")
+        devices = [other, first, second]
+        assert self._scan(monkeypatch, devices, product_id=0x7840) is first
+        assert self._scan(monkeypatch, devices, serial="B") is second
+        assert self._scan(monkeypatch, [other]) is None
+
+
+class _SyncEchoDevice:
+    """Bulk endpoints returning canned IN reads and swallowing OUT writes."""
+
+    def __init__(self, reads: list[bytes]) -> None:
+        self.reads = list(reads)
+        self.writes: list[bytes] = []
+
+    def write(self, ep: int, data: bytes, timeout: int) -> None:
+        self.writes.append(bytes(data))
+
+    def read(self, ep: int, buf: array.array, timeout: int) -> int:
+        data = self.reads.pop(0) if self.reads else b"\x32\x60"
+        buf[: len(data)] = array.array("B", data)
+        return len(data)
+
+
+class TestCheckSync:
+    """Test MPSSE bad-command echo detection (no hardware required)."""
+
+    @pytest.mark.parametrize(
+        "reads, found",
+        [
+            ([b"\x32\x60\xfa\xaa"], True),
+            ([b"\x32\x60", b"\x32\x60\x00\xfa\xaa\x00"], True),
+            ([b"\x32\x60\xfa", b"\xaa"], True),
+            ([b"\x32\x60\xfa\xab"], False),
+            ([b"\x32\x60"], False),
+        ],
+    )
+    def test_echo_detection(self, reads, found, monkeypatch):
+        """Test echo found in one read, a later read, or split across reads."""
+        monkeypatch.setattr(ftdi.time, "sleep", lambda s: None)
+        dev = FTDIDevice(_SyncEchoDevice(reads), 0x81, 0x02, 512)
+        assert dev._check_sync(0xAA) is found
+
+    @pytest.mark.parametrize(
+        "reads, found",
+        [
+            ([b"\x32\x60\xfa\xaa\xfa\xab"], True),
+            ([b"\x32\x60\xfa\xaa", b"\x32\x60\xfa\xab"], True),
+            ([b"\x32\x60\xfa\xaa"], False),
+        ],
+    )
+    def test_pair_pipelined(self, reads, found, monkeypatch):
+        """Test both probes go out in one write and both echoes are required."""
+        monkeypatch.setattr(ftdi.time, "sleep", lambda s: None)
+        usb_dev = _SyncEchoDevice(reads)
+        dev = FTDIDevice(usb_dev, 0x81, 0x02, 512)
+        assert dev._check_sync_pair([0xAA, 0xAB]) is found
+        assert usb_dev.writes == [b"\xaa\x87\xab\x87"]
+
+
+class TestRealBitrate:
+    """Test FTDI bitrate clamping and quantization (no hardware required)."""
+
+    @pytest.mark.parametrize(
+        "requested, expected",
+        [
+            (1, 458),
+            (458, 458),
+            (2_500_000, 2_500_000),
+            (7_000_000, 7_500_000),
+            (30_000_000, 30_000_000),
+            (50_000_000, 30_000_000),
+        ],
+    )
+    def test_clamp_and_quantize(self, requested, expected):
+        """Test that requested rates map to achievable divisor frequencies."""
+        assert real_bitrate(requested) == expected
+
+
+class _FakeBitBabbler(BitBabbler):
+    """BitBabbler with USB replaced by a random byte stream of `raw_len` bytes."""
+
+    def __init__(self, raw_len: int) -> None:
+        self.stream = os.urandom(raw_len)
+        self.pos = 0
+        self.reads: list[int] = []
+
+    def read_entropy(self, nbytes: int) -> bytes:
+        assert 1 <= nbytes <= bitbabbler._MAX_TRANSFER
+        self.reads.append(nbytes)
+        data = self.stream[self.pos : self.pos + nbytes]
+        self.pos += nbytes
+        assert len(data) == nbytes, "fake stream exhausted"
+        return data
+
+
+class _ShortReadBitBabbler(_FakeBitBabbler):
+    """Fake device that returns fewer bytes than requested."""
+
+    def read_entropy(self, nbytes: int) -> bytes:
+        return super().read_entropy(nbytes)[: nbytes // 2]
+
+
+class TestReadEntropyFolded:
+    """Test chunked/folded reads against a fake device (no hardware required)."""
+
+    @pytest.mark.parametrize("out_len", [1, 256, 4096, 70000, 300000])
+    @pytest.mark.parametrize("folds", [0, 1, 4])
+    def test_length_and_content(self, out_len, folds):
+        """Test output size and that it equals folding the raw stream."""
+        dev = _FakeBitBabbler(out_len << max(folds, 0))
+        data = dev.read_entropy_folded(out_len, folds)
+        assert isinstance(data, bytes)
+        assert len(data) == out_len
+        assert dev.pos == len(dev.stream)
+
+        # Rebuild expected output by folding each 64 KiB MPSSE segment of the
+        # raw transfers the device handed out
+        expected = bytearray()
+        offset = 0
+        for n in dev.reads:
+            for seg in range(offset, offset + n, 65536):
+                end = min(seg + 65536, offset + n)
+                expected += fold_bytes(dev.stream[seg:end], folds)
+            offset += n
+        assert data == bytes(expected)
+        assert len(dev.reads) == -(-(out_len << folds) // bitbabbler._MAX_TRANSFER)
+
+    def test_large_read_queues_commands(self):
+        """Test that one transfer queues several 64 KiB MPSSE read commands."""
+        dev = object.__new__(BitBabbler)
+        writes, reads = [], []
+        dev.write = writes.append
+        dev.read_data = lambda n: reads.append(n) or bytes(n)
+        assert len(dev.read_entropy(3 * 65536 + 10)) == 3 * 65536 + 10
+        assert reads == [3 * 65536 + 10]
+        assert writes == [bitbabbler._read_cmd(65536) * 3 + bitbabbler._read_cmd(10)]
+        with pytest.raises(ValueError):
+            dev.read_entropy(bitbabbler._MAX_TRANSFER + 1)
+
+    @pytest.mark.parametrize("folds", [0, 2])
+    def test_short_read_raises(self, folds):
+        """Test that a device returning too few bytes raises instead of spinning."""
+        dev = _ShortReadBitBabbler(4096 << folds)
+        with pytest.raises(RuntimeError, match="Short BitBabbler read"):
+            dev.read_entropy_folded(4096, folds)
+
+
+class TestRandomIntBatching:
+    """Test that random_int batches rejection candidates (no hardware required)."""
+
+    def test_one_read_per_batch(self, monkeypatch):
+        """Test that rejected candidates are drawn from a single device read."""
+        calls = []
+
+        def fake_get_bytes(n, folds=0):
+            calls.append((n, folds))
+            # All candidates but the last exceed the range and are rejected
+            return b"\xff" * (n - 1) + b"\x02"
+
+        monkeypatch.setattr(core, "get_bytes", fake_get_bytes)
+        assert random_int(10, 16, folds=1) == 12  # range 6 -> 3 bits, 0xff rejected
+        assert calls == [(core._RANDOM_INT_CANDIDATES, 1)]
+
+    def test_range_coverage(self, monkeypatch):
+        """Test that every value in the range is reachable."""
+        monkeypatch.setattr(core, "get_bytes", lambda n, folds=0: os.urandom(n))
+        assert {random_int(0, 6) for _ in range(300)} == set(range(6))
+
+
+class TestIterBytes:
+    """Test the streaming reader (no hardware required)."""
+
+    def test_yields_chunks(self, monkeypatch):
+        """Test that each chunk is one get_bytes call with the same folds."""
+        calls = []
+
+        def fake_get_bytes(n, folds=0):
+            calls.append((n, folds))
+            return bytes(n)
+
+        monkeypatch.setattr(core, "get_bytes", fake_get_bytes)
+        stream = iter_bytes(16, folds=2)
+        assert [next(stream) for _ in range(3)] == [bytes(16)] * 3
+        assert calls == [(16, 2)] * 3
 
 
 class TestBitBabblerRNG:
@@ -32,13 +432,12 @@ class TestBitBabblerRNG:
         assert len(data) == small_test_size
 
     @pytest.mark.hardware("bitbabbler_rng")
-    def test_get_bytes_with_folds(self, skip_if_no_device, small_test_size):
+    @pytest.mark.parametrize("folds", [0, 1, 2, 3, 4])
+    def test_get_bytes_with_folds(self, skip_if_no_device, small_test_size, folds):
         """Test get_bytes function with folding parameter."""
-        # Test different fold levels (0-4)
-        for folds in range(5):
-            data = get_bytes(small_test_size, folds=folds)
-            assert isinstance(data, bytes)
-            assert len(data) == small_test_size
+        data = get_bytes(small_test_size, folds=folds)
+        assert isinstance(data, bytes)
+        assert len(data) == small_test_size
 
     @pytest.mark.hardware("bitbabbler_rng")
     def test_get_bits(self, skip_if_no_device):
@@ -51,12 +450,12 @@ class TestBitBabblerRNG:
         assert len(data) * 8 >= 100
 
     @pytest.mark.hardware("bitbabbler_rng")
-    def test_get_bits_with_folds(self, skip_if_no_device):
+    @pytest.mark.parametrize("folds", [0, 1, 2, 3, 4])
+    def test_get_bits_with_folds(self, skip_if_no_device, folds):
         """Test get_bits function with folding."""
-        for folds in range(5):
-            data = get_bits(100, folds=folds)
-            assert isinstance(data, bytes)
-            assert len(data) >= 13
+        data = get_bits(100, folds=folds)
+        assert isinstance(data, bytes)
+        assert len(data) >= 13
 
     @pytest.mark.hardware("bitbabbler_rng")
     def test_get_exact_bits(self, skip_if_no_device):
@@ -67,12 +466,12 @@ class TestBitBabblerRNG:
         assert len(data) == 16  # 128 bits = 16 bytes
 
     @pytest.mark.hardware("bitbabbler_rng")
-    def test_get_exact_bits_with_folds(self, skip_if_no_device):
+    @pytest.mark.parametrize("folds", [0, 1, 2, 3, 4])
+    def test_get_exact_bits_with_folds(self, skip_if_no_device, folds):
         """Test get_exact_bits function with folding."""
-        for folds in range(5):
-            data = get_exact_bits(128, folds=folds)
-            assert isinstance(data, bytes)
-            assert len(data) == 16
+        data = get_exact_bits(128, folds=folds)
+        assert isinstance(data, bytes)
+        assert len(data) == 16
 
     @pytest.mark.hardware("bitbabbler_rng")
     def test_random_int(self, skip_if_no_device):
@@ -94,40 +493,38 @@ class TestBitBabblerRNG:
         close()
 
     @pytest.mark.hardware("bitbabbler_rng")
-    def test_get_bytes_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize("n", [0, -1])
+    def test_get_bytes_validation(self, skip_if_no_device, n):
         """Test input validation for get_bytes."""
         with pytest.raises(ValueError, match="n must be positive"):
-            get_bytes(0)
-
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_bytes(-1)
+            get_bytes(n)
 
     @pytest.mark.hardware("bitbabbler_rng")
-    def test_get_bits_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize("n", [0, -1])
+    def test_get_bits_validation(self, skip_if_no_device, n):
         """Test input validation for get_bits."""
         with pytest.raises(ValueError, match="n must be positive"):
-            get_bits(0)
-
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_bits(-1)
+            get_bits(n)
 
     @pytest.mark.hardware("bitbabbler_rng")
-    def test_get_exact_bits_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize(
+        ("n", "match"),
+        [
+            (0, "n must be positive"),
+            (100, "n must be divisible by 8"),  # 100 % 8 != 0
+        ],
+    )
+    def test_get_exact_bits_validation(self, skip_if_no_device, n, match):
         """Test input validation for get_exact_bits."""
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_exact_bits(0)
-
-        with pytest.raises(ValueError, match="n must be divisible by 8"):
-            get_exact_bits(100)  # 100 % 8 != 0
+        with pytest.raises(ValueError, match=match):
+            get_exact_bits(n)
 
     @pytest.mark.hardware("bitbabbler_rng")
-    def test_random_int_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize(("min_val", "max_val"), [(10, 10), (20, 10)])
+    def test_random_int_validation(self, skip_if_no_device, min_val, max_val):
         """Test input validation for random_int."""
         with pytest.raises(ValueError, match="min_val must be less than max_val"):
-            random_int(10, 10)
-
-        with pytest.raises(ValueError, match="min_val must be less than max_val"):
-            random_int(20, 10)
+            random_int(min_val, max_val)
 
     @pytest.mark.hardware("bitbabbler_rng")
     def test_fold_parameter_validation(self, skip_if_no_device, small_test_size):
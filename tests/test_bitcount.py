@@ -0,0 +1,76 @@
+"""
+Tests for the popcount helper service.
+
+Software-only; no hardware required.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from lib.services import bitcount
+from lib.services.bitcount import popcount_blocks, popcount_bytes
+
+
+def _popcount_reference(data: bytes) -> int:
+    """Reference per-byte popcount."""
+    return sum(bin(b).count("1") for b in data)
+
+
+class TestPopcountBytes:
+    """Test popcount_bytes on both the big-int and NumPy paths."""
+
+    @pytest.mark.parametrize("size", [0, 1, 256, 2048, 2049, 65536])
+    def test_matches_reference(self, size):
+        """Test counts against the reference for sizes around the cutover."""
+        data = os.urandom(size)
+        assert popcount_bytes(data) == _popcount_reference(data)
+
+    def test_edge_patterns(self):
+        """Test all-zero and all-one buffers."""
+        assert popcount_bytes(b"\x00" * 4096) == 0
+        assert popcount_bytes(b"\xff" * 4096) == 4096 * 8
+
+    def test_scratch_buffer(self):
+        """Test that a matching scratch buffer is used and a mismatched one ignored."""
+        data = os.urandom(8192)
+        out = np.empty(len(data), dtype=np.uint8)
+        assert popcount_bytes(data, out) == _popcount_reference(data)
+        # Word-aligned input: the scratch holds one count per uint64 word
+        assert int(out[: len(data) // 8].sum()) == _popcount_reference(data)
+        assert popcount_bytes(data, np.empty(3, dtype=np.uint8)) == popcount_bytes(data)
+
+
+class TestSwarPopcount:
+    """Test the SWAR word popcount used when np.bitwise_count is missing."""
+
+    def test_matches_reference(self):
+        """Test per-word counts, including all-zero and all-one words."""
+        data = os.urandom(4096) + b"\x00" * 8 + b"\xff" * 8
+        words = np.frombuffer(data, dtype=np.uint64)
+        expected = [
+            _popcount_reference(data[i : i + 8]) for i in range(0, len(data), 8)
+        ]
+        assert bitcount._swar_u64(words).tolist() == expected
+
+
+class TestPopcountBlocks:
+    """Test per-block popcount on word-aligned and odd block widths."""
+
+    @pytest.mark.parametrize(
+        "block_bytes, size", [(1, 7), (3, 10), (8, 64), (256, 1000)]
+    )
+    def test_matches_reference(self, block_bytes, size):
+        """Test per-block counts, with any partial tail as the last block."""
+        data = os.urandom(size)
+        counts = popcount_blocks(np.frombuffer(data, dtype=np.uint8), block_bytes)
+        expected = [
+            _popcount_reference(data[i : i + block_bytes])
+            for i in range(0, size, block_bytes)
+        ]
+        assert counts.tolist() == expected
+
+    def test_empty(self):
+        """Test that an empty buffer yields no blocks."""
+        assert popcount_blocks(np.empty(0, dtype=np.uint8), 8).size == 0
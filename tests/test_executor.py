@@ -0,0 +1,82 @@
+"""
+Tests for the per-backend executor registry.
+
+Software-only; no hardware required.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from lib.rng_devices import _executor
+
+
+class TestExecutorRegistry:
+    """Test executor reuse, isolation, and re-creation after shutdown."""
+
+    def test_reuse_and_isolation(self):
+        """Test that a name maps to one executor and names do not share one."""
+        first = _executor.get_executor("test_a")
+        assert _executor.get_executor("test_a") is first
+        assert _executor.get_executor("test_b") is not first
+        assert first._max_workers == 1
+        _executor.shutdown_executor("test_a")
+        _executor.shutdown_executor("test_b")
+
+    def test_concurrent_pool_size(self, monkeypatch):
+        """Test that only opted-in backends get RNG_TUI_THREAD_POOL workers."""
+        monkeypatch.setenv(_executor.POOL_SIZE_ENV, "4")
+        assert _executor.get_executor("test_g", concurrent=True)._max_workers == 4
+        assert _executor.get_executor("test_h")._max_workers == 1
+        monkeypatch.setenv(_executor.POOL_SIZE_ENV, "many")
+        assert _executor.get_executor("test_i", concurrent=True)._max_workers == 1
+        for name in ("test_g", "test_h", "test_i"):
+            _executor.shutdown_executor(name)
+
+    def test_recreated_after_shutdown(self):
+        """Test that a shut-down executor is replaced on next use."""
+        first = _executor.get_executor("test_c")
+        assert first.submit(lambda: 42).result() == 42
+        _executor.shutdown_executor("test_c")
+        second = _executor.get_executor("test_c")
+        assert second is not first
+        assert second.submit(lambda: 7).result() == 7
+        _executor.shutdown_executor("test_c")
+        # Unknown names are a no-op
+        _executor.shutdown_executor("never_used")
+
+    def test_shutdown_all(self):
+        """Test that shutdown_all releases every executor in one call."""
+        first = _executor.get_executor("test_d")
+        other = _executor.get_executor("test_e")
+        _executor.shutdown_all()
+        assert first._shutdown and other._shutdown
+        assert _executor.get_executor("test_d") is not first
+        _executor.shutdown_executor("test_d")
+
+    def test_run_cancellable(self):
+        """Test that results pass through and cancellation runs the cleanup."""
+        executor = _executor.get_executor("test_f")
+        cleanups = []
+        release = threading.Event()
+
+        async def run():
+            result = await _executor.run_cancellable(
+                executor, lambda: cleanups.append("x"), pow, 2, 10
+            )
+            task = asyncio.ensure_future(
+                _executor.run_cancellable(
+                    executor, lambda: cleanups.append("closed"), release.wait
+                )
+            )
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.set()
+            return result
+
+        assert asyncio.run(run()) == 1024
+        assert cleanups == ["closed"]
+        _executor.shutdown_executor("test_f")
@@ -0,0 +1,39 @@
+"""
+Tests for the capture filename service.
+
+Software-only; no hardware required.
+"""
+
+import pytest
+
+from lib.services import filenames
+
+
+class TestFilenames:
+    """Test capture name formatting and parsing."""
+
+    def test_format_capture_name_round_trip(self):
+        """Test that a formatted name parses back to the same parameters."""
+        name = filenames.format_capture_name("bitb", 2048, 1, folds=2)
+        assert name.endswith("_bitb_s2048_i1_f2")
+        assert filenames.parse_bits(name) == 2048
+        assert filenames.parse_interval(name) == 1
+
+    def test_folds_only_for_bitbabbler(self):
+        """Test that the folds suffix is only added for BitBabbler captures."""
+        name = filenames.format_capture_name("trng", 512, 5, folds=2)
+        assert name.endswith("_trng_s512_i5")
+
+    def test_parse_from_path(self):
+        """Test parsing parameters from a full capture path."""
+        path = "data/raw/20250208T143022_intel_s4096_i10.csv"
+        assert filenames.parse_bits(path) == 4096
+        assert filenames.parse_interval(path) == 10
+
+    def test_parse_missing_raises(self):
+        """Test that names without parameters raise ValueError every time."""
+        for _ in range(2):
+            with pytest.raises(ValueError, match="bits not found"):
+                filenames.parse_bits("random.csv")
+            with pytest.raises(ValueError, match="interval not found"):
+                filenames.parse_interval("random.csv")
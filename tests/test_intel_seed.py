@@ -4,15 +4,22 @@ Tests for intel_seed (Intel RDSEED hardware RNG).
 These tests will be skipped if RDSEED is not available (older CPUs).
 """
 
+import array
+import asyncio
+
 import pytest
 
 from lib.rng_devices.intel_seed import (
     close,
+    close_async,
     get_bits,
     get_bytes,
+    get_bytes_async,
     get_exact_bits,
+    get_rdseed,
     is_device_available,
     random_int,
+    random_int_async,
 )
 
 
@@ -31,6 +38,26 @@ class TestIntelSeed:
         assert isinstance(data, bytes)
         assert len(data) == small_test_size
 
+    @pytest.mark.hardware("intel_seed")
+    def test_get_bytes_into(self, skip_if_no_device):
+        """Test filling caller buffers in place, including memoryview slices."""
+        rdseed = get_rdseed()
+        buf = bytearray(64)
+        assert rdseed.get_bytes_into(memoryview(buf)[16:48]) == 32
+        assert buf[:16] == bytes(16) and buf[48:] == bytes(16)
+
+        # Multi-byte items: the whole buffer is filled and counted in bytes
+        # (a filled 16-byte quarter is all zero with odds 2**-128)
+        words = array.array("I", bytes(64))
+        assert rdseed.get_bytes_into(memoryview(words)) == 64
+        raw = words.tobytes()
+        assert all(raw[i : i + 16] != bytes(16) for i in range(0, 64, 16))
+
+        with pytest.raises(ValueError, match="out must not be empty"):
+            rdseed.get_bytes_into(bytearray())
+        with pytest.raises(TypeError):
+            rdseed.get_bytes_into(bytes(8))
+
     @pytest.mark.hardware("intel_seed")
     def test_get_bits(self, skip_if_no_device):
         """Test get_bits function."""
@@ -62,6 +89,13 @@ class TestIntelSeed:
         assert isinstance(result, int)
         assert 10 <= result < 20
 
+    @pytest.mark.hardware("intel_seed")
+    def test_random_int_covers_range(self, skip_if_no_device):
+        """Test that batched rejection sampling hits every value and stays in range."""
+        for min_val, max_val in [(0, 5), (-3, 3), (0, 129), (10, 11)]:
+            seen = {random_int(min_val, max_val) for _ in range(2000)}
+            assert seen == set(range(min_val, max_val))
+
     @pytest.mark.hardware("intel_seed")
     def test_close(self, skip_if_no_device):
         """Test close function."""
@@ -69,37 +103,76 @@ class TestIntelSeed:
         close()
 
     @pytest.mark.hardware("intel_seed")
-    def test_get_bytes_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize("n", [0, -1])
+    def test_get_bytes_validation(self, skip_if_no_device, n):
         """Test input validation for get_bytes."""
         with pytest.raises(ValueError, match="n_bytes must be positive"):
-            get_bytes(0)
-
-        with pytest.raises(ValueError, match="n_bytes must be positive"):
-            get_bytes(-1)
+            get_bytes(n)
 
     @pytest.mark.hardware("intel_seed")
-    def test_get_bits_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize("n", [0, -1])
+    def test_get_bits_validation(self, skip_if_no_device, n):
         """Test input validation for get_bits."""
         with pytest.raises(ValueError, match="n_bits must be positive"):
-            get_bits(0)
-
-        with pytest.raises(ValueError, match="n_bits must be positive"):
-            get_bits(-1)
+            get_bits(n)
 
     @pytest.mark.hardware("intel_seed")
-    def test_get_exact_bits_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize(
+        ("n", "match"),
+        [
+            (0, "n_bits must be positive"),
+            (100, "n_bits must be divisible by 8"),  # 100 % 8 != 0
+        ],
+    )
+    def test_get_exact_bits_validation(self, skip_if_no_device, n, match):
         """Test input validation for get_exact_bits."""
-        with pytest.raises(ValueError, match="n_bits must be positive"):
-            get_exact_bits(0)
-
-        with pytest.raises(ValueError, match="n_bits must be divisible by 8"):
-            get_exact_bits(100)  # 100 % 8 != 0
+        with pytest.raises(ValueError, match=match):
+            get_exact_bits(n)
 
     @pytest.mark.hardware("intel_seed")
-    def test_random_int_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize(("min_val", "max_val"), [(10, 10), (20, 10)])
+    def test_random_int_validation(self, skip_if_no_device, min_val, max_val):
         """Test input validation for random_int."""
         with pytest.raises(ValueError, match="min_val must be less than max_val"):
-            random_int(10, 10)
+            random_int(min_val, max_val)
 
-        with pytest.raises(ValueError, match="min_val must be less than max_val"):
-            random_int(20, 10)
+    @pytest.mark.hardware("intel_seed")
+    def test_get_bytes_async_inline_and_executor(self, skip_if_no_device, monkeypatch):
+        """Test small async requests run inline and large ones use the executor."""
+        from lib.rng_devices.intel_seed import intel_seed as impl
+
+        submitted = []
+        real_get_executor = impl._get_executor
+
+        def tracking_get_executor():
+            submitted.append(True)
+            return real_get_executor()
+
+        monkeypatch.setattr(impl, "_get_executor", tracking_get_executor)
+
+        async def run():
+            small = await get_bytes_async(impl._ASYNC_THRESHOLD - 1)
+            assert not submitted
+            large = await get_bytes_async(impl._ASYNC_THRESHOLD)
+            assert submitted
+            await close_async()
+            return small, large
+
+        small, large = asyncio.run(run())
+        assert len(small) == impl._ASYNC_THRESHOLD - 1
+        assert len(large) == impl._ASYNC_THRESHOLD
+
+        # random_int_async: typical ranges inline, very wide ones offloaded
+        submitted.clear()
+
+        async def run_int():
+            value = await random_int_async(0, 1000)
+            assert not submitted
+            wide = await random_int_async(0, 1 << impl._ASYNC_THRESHOLD)
+            assert submitted
+            await close_async()
+            return value, wide
+
+        value, wide = asyncio.run(run_int())
+        assert 0 <= value < 1000
+        assert 0 <= wide < 1 << impl._ASYNC_THRESHOLD
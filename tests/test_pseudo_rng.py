@@ -4,10 +4,13 @@ Tests for pseudo_rng (software RNG fallback).
 Since this is software-only, all tests should pass regardless of hardware.
 """
 
+import asyncio
+
 import pytest
 
 from lib.rng_devices.pseudo_rng import (
     close,
+    core,
     get_bits,
     get_bytes,
     get_exact_bits,
@@ -80,37 +83,95 @@ class TestPseudoRNG:
         close()
 
     @pytest.mark.hardware("pseudo_rng")
-    def test_get_bytes_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize("n", [0, -1])
+    def test_get_bytes_validation(self, skip_if_no_device, n):
         """Test input validation for get_bytes."""
         with pytest.raises(ValueError, match="n must be positive"):
-            get_bytes(0)
-
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_bytes(-1)
+            get_bytes(n)
 
     @pytest.mark.hardware("pseudo_rng")
-    def test_get_bits_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize("n", [0, -1])
+    def test_get_bits_validation(self, skip_if_no_device, n):
         """Test input validation for get_bits."""
         with pytest.raises(ValueError, match="n must be positive"):
-            get_bits(0)
-
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_bits(-1)
+            get_bits(n)
 
     @pytest.mark.hardware("pseudo_rng")
-    def test_get_exact_bits_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize(
+        ("n", "match"),
+        [
+            (0, "n must be positive"),
+            (100, "n must be divisible by 8"),  # 100 % 8 != 0
+        ],
+    )
+    def test_get_exact_bits_validation(self, skip_if_no_device, n, match):
         """Test input validation for get_exact_bits."""
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_exact_bits(0)
-
-        with pytest.raises(ValueError, match="n must be divisible by 8"):
-            get_exact_bits(100)  # 100 % 8 != 0
+        with pytest.raises(ValueError, match=match):
+            get_exact_bits(n)
 
     @pytest.mark.hardware("pseudo_rng")
-    def test_random_int_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize(("min_val", "max_val"), [(10, 10), (20, 10)])
+    def test_random_int_validation(self, skip_if_no_device, min_val, max_val):
         """Test input validation for random_int."""
         with pytest.raises(ValueError, match="min_val must be less than max_val"):
-            random_int(10, 10)
+            random_int(min_val, max_val)
 
-        with pytest.raises(ValueError, match="min_val must be less than max_val"):
-            random_int(20, 10)
+    @pytest.mark.hardware("pseudo_rng")
+    def test_entropy_pool_buffering(self, skip_if_no_device, monkeypatch):
+        """Test small draws share one refill and large draws bypass the pool."""
+        refills = []
+        real_urandom = core.os.urandom
+
+        def counting_urandom(n):
+            refills.append(n)
+            return real_urandom(n)
+
+        monkeypatch.setattr(core.os, "urandom", counting_urandom)
+        core._reset_pool()
+        chunks = [get_bytes(16) for _ in range(core._POOL_SIZE // 16)]
+        assert refills == [core._POOL_SIZE]
+        assert all(len(c) == 16 for c in chunks)
+        assert len(set(chunks)) == len(chunks)
+
+        get_bytes(16)
+        assert len(refills) == 2
+        # A large request is one direct read and leaves the pool untouched
+        pos = core._pool_pos
+        assert len(get_bytes(core._POOL_SIZE)) == core._POOL_SIZE
+        assert refills[2:] == [core._POOL_SIZE] and core._pool_pos == pos
+
+    @pytest.mark.hardware("pseudo_rng")
+    def test_bounded_uniform(self, skip_if_no_device):
+        """Test the bounded generator covers small and above-64-bit ranges."""
+        assert {core._bounded(3) for _ in range(300)} == {0, 1, 2}
+        assert all(0 <= core._bounded(1 << 70) < 1 << 70 for _ in range(50))
+        assert {random_int(-2, 2) for _ in range(300)} == {-2, -1, 0, 1}
+
+    @pytest.mark.hardware("pseudo_rng")
+    def test_async_after_close_async(self, skip_if_no_device):
+        """Test inline and executor-backed async calls, including after shutdown."""
+
+        async def run():
+            small = await core.get_bytes_async(16)
+            await core.close_async()
+            large = await core.get_bytes_async(core._ASYNC_THRESHOLD)
+            value = await core.random_int_async(0, 10)
+            return small, large, value
+
+        small, large, value = asyncio.run(run())
+        assert len(small) == 16
+        assert len(large) == core._ASYNC_THRESHOLD
+        assert 0 <= value < 10
+
+    @pytest.mark.hardware("pseudo_rng")
+    def test_get_counts(self, skip_if_no_device):
+        """Test batched per-block ones counts and their validation."""
+        counts = core.get_counts(1000, 2048)
+        assert counts.shape == (1000,)
+        assert ((counts >= 0) & (counts <= 2048)).all()
+        assert 1000 < counts.mean() < 1048
+
+        with pytest.raises(ValueError, match="n_blocks must be positive"):
+            core.get_counts(0, 2048)
+        with pytest.raises(ValueError, match="divisible by 8"):
+            core.get_counts(10, 100)
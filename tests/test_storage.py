@@ -0,0 +1,221 @@
+"""
+Tests for the storage service (CSV/binary readers and writers).
+
+These tests are software-only and use pytest's tmp_path for file output.
+"""
+
+import os
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lib.services import storage
+from lib.services.storage import (
+    CountWriter,
+    add_zscore,
+    concat_csv_files,
+    read_bin_counts,
+    read_csv_counts,
+    write_csv_count,
+    write_csv_counts,
+    write_excel_with_chart,
+)
+
+
+class TestCSVWriters:
+    """Test CSV count writers."""
+
+    def test_write_csv_counts_appends_rows(self, tmp_path):
+        """Test that batched rows are appended in order with the capture format."""
+        stem = str(tmp_path / "capture")
+        rows = [
+            (datetime(2025, 2, 8, 14, 30, 22), 1024),
+            (datetime(2025, 2, 8, 14, 30, 23), 1019),
+        ]
+        write_csv_counts(rows, stem)
+        write_csv_counts(rows[:1], stem)
+
+        lines = (tmp_path / "capture.csv").read_text().splitlines()
+        assert lines == [
+            "20250208T143022,1024",
+            "20250208T143023,1019",
+            "20250208T143022,1024",
+        ]
+
+    def test_write_csv_count_single_row(self, tmp_path):
+        """Test that the single-row writer produces one time,count line."""
+        stem = str(tmp_path / "single")
+        write_csv_count(512, stem)
+
+        lines = (tmp_path / "single.csv").read_text().splitlines()
+        assert len(lines) == 1
+        timestamp, count = lines[0].split(",")
+        assert len(timestamp) == 15 and timestamp[8] == "T"
+        assert count == "512"
+
+    def test_count_writer_keeps_file_open(self, tmp_path):
+        """Test that one writer appends several batches through one handle."""
+        stem = str(tmp_path / "run")
+        ts = datetime(2025, 2, 8, 14, 30, 22)
+        with CountWriter(stem) as writer:
+            writer.write_rows([(ts, 1)])
+            fh = writer._fh
+            writer.write_rows([(ts, 2), (ts, 3)])
+            assert writer._fh is fh
+            # Flushed per batch, so rows are visible before close
+            assert (tmp_path / "run.csv").read_bytes().count(b"\r\n") == 3
+        assert writer._fh is None
+        assert (tmp_path / "run.csv").read_bytes() == (
+            b"20250208T143022,1\r\n20250208T143022,2\r\n20250208T143022,3\r\n"
+        )
+
+    def test_count_writer_reuses_second_stamp(self, tmp_path):
+        """Test rows within one second share a stamp and a new second re-formats."""
+        stem = str(tmp_path / "fast")
+        rows = [
+            (datetime(2025, 2, 8, 14, 30, 22, 100), 1),
+            (datetime(2025, 2, 8, 14, 30, 22, 900000), 2),
+            (datetime(2025, 2, 8, 14, 30, 23, 5), 3),
+        ]
+        with CountWriter(stem) as writer:
+            writer.write_rows(rows)
+        lines = (tmp_path / "fast.csv").read_text().splitlines()
+        assert lines == [
+            "20250208T143022,1",
+            "20250208T143022,2",
+            "20250208T143023,3",
+        ]
+
+
+class TestCSVReaders:
+    """Test CSV count readers."""
+
+    def test_read_csv_counts_typed_columns(self, tmp_path):
+        """Test that counts are parsed as int32 and times as HH:MM:SS."""
+        path = tmp_path / "capture.csv"
+        path.write_text("20250208T143022,1024\n20250208T143023,1019\n")
+
+        df = read_csv_counts(str(path))
+        assert list(df.columns) == ["time", "ones"]
+        assert df["ones"].dtype == np.int32
+        assert df["ones"].tolist() == [1024, 1019]
+        assert df["time"].tolist() == ["14:30:22", "14:30:23"]
+
+    @pytest.mark.parametrize(
+        "line",
+        ["2025-02-08 14:30:22,1\n", "20250208X143022,1\n", "20250208T1430ab,1\n"],
+    )
+    def test_read_csv_counts_rejects_bad_timestamp(self, tmp_path, line):
+        """Test that timestamps not in the capture format raise RuntimeError."""
+        path = tmp_path / "bad.csv"
+        path.write_text("20250208T143022,1024\n" + line)
+        with pytest.raises(RuntimeError, match="Failed to read CSV file"):
+            read_csv_counts(str(path))
+
+
+class TestBinReaders:
+    """Test the binary capture reader."""
+
+    @pytest.mark.parametrize("block_bits, size", [(8, 5), (64, 40), (2048, 1000)])
+    def test_read_bin_counts_per_block(self, tmp_path, block_bits, size):
+        """Test per-block counts, including a trailing partial block."""
+        data = os.urandom(size)
+        path = tmp_path / "capture.bin"
+        path.write_bytes(data)
+
+        step = block_bits // 8
+        expected = [
+            sum(bin(b).count("1") for b in data[i : i + step])
+            for i in range(0, size, step)
+        ]
+        df = read_bin_counts(str(path), block_bits)
+        assert list(df.columns) == ["samples", "ones"]
+        assert df["samples"].tolist() == list(range(1, len(expected) + 1))
+        assert df["ones"].tolist() == expected
+
+    def test_read_bin_counts_tiled(self, tmp_path, monkeypatch):
+        """Test that counts are unchanged when the file spans several tiles."""
+        monkeypatch.setattr(storage, "_BIN_TILE_BYTES", 24)
+        data = os.urandom(100)
+        path = tmp_path / "capture.bin"
+        path.write_bytes(data)
+
+        df = read_bin_counts(str(path), 64)
+        expected = [
+            sum(bin(b).count("1") for b in data[i : i + 8]) for i in range(0, 100, 8)
+        ]
+        assert df["ones"].tolist() == expected
+
+    def test_read_bin_counts_empty_and_missing(self, tmp_path):
+        """Test an empty capture yields no rows and a missing one raises."""
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+        assert read_bin_counts(str(path), 8).empty
+        with pytest.raises(RuntimeError):
+            read_bin_counts(str(tmp_path / "missing.bin"), 8)
+
+    def test_read_bin_counts_rejects_bad_block(self, tmp_path):
+        """Test that block sizes not divisible by 8 are rejected."""
+        with pytest.raises(ValueError):
+            read_bin_counts(str(tmp_path / "missing.bin"), 12)
+
+
+class TestZScore:
+    """Test cumulative Z-score calculation."""
+
+    def test_add_zscore_matches_expanding_mean(self):
+        """Test against the pandas expanding-mean formulation."""
+        ones = np.random.default_rng(0).binomial(2048, 0.5, size=500)
+        df = add_zscore(pd.DataFrame({"ones": ones}), 2048)
+
+        expected_mean = df["ones"].expanding().mean()
+        expected_z = (expected_mean - 1024) / (np.sqrt(512) / np.sqrt(df.index + 1))
+        np.testing.assert_allclose(df["cumulative_mean"], expected_mean)
+        np.testing.assert_allclose(df["z_test"], expected_z)
+
+    def test_add_zscore_rejects_bad_block(self):
+        """Test that non-positive block sizes are rejected."""
+        with pytest.raises(ValueError):
+            add_zscore(pd.DataFrame({"ones": [1]}), 0)
+
+
+class TestConcat:
+    """Test CSV concatenation."""
+
+    def test_concat_csv_files_appends_in_order(self, tmp_path):
+        """Test that inputs are copied byte for byte, in order."""
+        parts = [b"a,1\nb,2\n", b"c,3\r\n", b"d,4"]
+        names = []
+        for i, part in enumerate(parts):
+            path = tmp_path / f"part{i}.csv"
+            path.write_bytes(part)
+            names.append(str(path))
+
+        out = concat_csv_files(names, "joined")
+        assert out == str(tmp_path / "joined.csv")
+        assert (tmp_path / "joined.csv").read_bytes() == b"".join(parts)
+
+    def test_concat_csv_files_requires_input(self):
+        """Test that an empty file list is rejected."""
+        with pytest.raises(ValueError):
+            concat_csv_files([], "joined")
+
+
+class TestExcelWriters:
+    """Test the streamed Excel export."""
+
+    def test_write_excel_with_chart_rows_and_chart(self, tmp_path):
+        """Test that every row is written in order and the chart is attached."""
+        pytest.importorskip("xlsxwriter")
+        df = add_zscore(pd.DataFrame({"samples": [1, 2, 3], "ones": [5, 3, 4]}), 8)
+        out = write_excel_with_chart(df, str(tmp_path / "capture.bin"), 8, 1)
+
+        with zipfile.ZipFile(out) as xlsx:
+            sheet = xlsx.read("xl/worksheets/sheet1.xml").decode()
+            names = xlsx.namelist()
+        assert sheet.count("<row ") == 4
+        assert sheet.index('r="A1"') < sheet.index('r="A2"') < sheet.index('r="A4"')
+        assert any(name.startswith("xl/charts/") for name in names)
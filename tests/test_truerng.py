@@ -4,14 +4,20 @@ Tests for truerng (TrueRNG hardware RNG).
 These tests will be skipped if TrueRNG hardware is not connected.
 """
 
+import os
+import threading
+import time
+
 import pytest
 
 from lib.rng_devices.truerng import (
     close,
+    core,
     get_bits,
     get_bytes,
     get_exact_bits,
     is_device_available,
+    iter_bytes,
     random_int,
 )
 
@@ -69,37 +75,254 @@ class TestTrueRNG:
         close()
 
     @pytest.mark.hardware("truerng")
-    def test_get_bytes_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize("n", [0, -1])
+    def test_get_bytes_validation(self, skip_if_no_device, n):
         """Test input validation for get_bytes."""
         with pytest.raises(ValueError, match="n must be positive"):
-            get_bytes(0)
-
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_bytes(-1)
+            get_bytes(n)
 
     @pytest.mark.hardware("truerng")
-    def test_get_bits_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize("n", [0, -1])
+    def test_get_bits_validation(self, skip_if_no_device, n):
         """Test input validation for get_bits."""
         with pytest.raises(ValueError, match="n must be positive"):
-            get_bits(0)
-
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_bits(-1)
+            get_bits(n)
 
     @pytest.mark.hardware("truerng")
-    def test_get_exact_bits_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize(
+        ("n", "match"),
+        [
+            (0, "n must be positive"),
+            (100, "n must be divisible by 8"),  # 100 % 8 != 0
+        ],
+    )
+    def test_get_exact_bits_validation(self, skip_if_no_device, n, match):
         """Test input validation for get_exact_bits."""
-        with pytest.raises(ValueError, match="n must be positive"):
-            get_exact_bits(0)
-
-        with pytest.raises(ValueError, match="n must be divisible by 8"):
-            get_exact_bits(100)  # 100 % 8 != 0
+        with pytest.raises(ValueError, match=match):
+            get_exact_bits(n)
 
     @pytest.mark.hardware("truerng")
-    def test_random_int_validation(self, skip_if_no_device):
+    @pytest.mark.parametrize(("min_val", "max_val"), [(10, 10), (20, 10)])
+    def test_random_int_validation(self, skip_if_no_device, min_val, max_val):
         """Test input validation for random_int."""
         with pytest.raises(ValueError, match="min_val must be less than max_val"):
-            random_int(10, 10)
+            random_int(min_val, max_val)
 
-        with pytest.raises(ValueError, match="min_val must be less than max_val"):
-            random_int(20, 10)
+
+class _FakeSerial:
+    """Stand-in for serial.Serial that serves zero bytes or raises on read."""
+
+    opened: list["_FakeSerial"] = []
+
+    def __init__(self, port: str, timeout: int) -> None:
+        self.port = port
+        self.is_open = True
+        self.fail_reads = 0
+        self.cancelled = threading.Event()
+        self.closed_by: threading.Thread | None = None
+        _FakeSerial.opened.append(self)
+
+    def setDTR(self, value: bool) -> None:  # noqa: N802 - pyserial API
+        pass
+
+    def flushInput(self) -> None:  # noqa: N802 - pyserial API
+        pass
+
+    def read(self, n: int) -> bytes:
+        if self.fail_reads:
+            self.fail_reads -= 1
+            raise core.serial.SerialException("device reports readiness")
+        return bytes(n)
+
+    def cancel_read(self) -> None:
+        self.cancelled.set()
+
+    def close(self) -> None:
+        self.is_open = False
+        self.closed_by = threading.current_thread()
+
+
+class TestSerialCache:
+    """Test serial handle reuse and recovery (no hardware required)."""
+
+    @pytest.fixture(autouse=True)
+    def fake_port(self, monkeypatch):
+        _FakeSerial.opened = []
+        monkeypatch.setattr(core, "_find_port", lambda: "/dev/fake-trng")
+        monkeypatch.setattr(core, "_reset_tty_min", lambda ser: None)
+        monkeypatch.setattr(core.serial, "Serial", _FakeSerial)
+        core._drop_serial()
+        yield
+        core._drop_serial()
+
+    def test_handle_reused_and_closed(self):
+        """Test that reads share one port and close() releases it."""
+        assert get_bytes(4) == bytes(4)
+        assert get_bytes(8) == bytes(8)
+        assert len(_FakeSerial.opened) == 1
+        close()
+        assert not _FakeSerial.opened[0].is_open
+        get_bytes(1)
+        assert len(_FakeSerial.opened) == 2
+
+    def test_iter_bytes_reuses_handle(self):
+        """Test that a stream yields chunk-sized reads on one open port."""
+        stream = iter_bytes(32)
+        assert [len(next(stream)) for _ in range(4)] == [32] * 4
+        assert len(_FakeSerial.opened) == 1
+
+    def test_serial_error_reopens_once(self, monkeypatch):
+        """Test that a serial error retries on a fresh port, then gives up."""
+        get_bytes(1)
+        _FakeSerial.opened[0].fail_reads = 1
+        assert get_bytes(2) == bytes(2)
+        assert len(_FakeSerial.opened) == 2 and not _FakeSerial.opened[0].is_open
+
+        def always_fail(self, n):
+            raise core.serial.SerialException("gone")
+
+        monkeypatch.setattr(_FakeSerial, "read", always_fail)
+        with pytest.raises(RuntimeError, match="TrueRNG read failed"):
+            get_bytes(2)
+        assert len(_FakeSerial.opened) == 3 and core._cached_serial is None
+
+    def test_serial_error_after_close_not_retried(self, monkeypatch):
+        """Test that a read failing because close() ran does not reopen."""
+
+        def closed_mid_read(self, n):
+            close()
+            raise core.serial.SerialException("port closed")
+
+        monkeypatch.setattr(_FakeSerial, "read", closed_mid_read)
+        with pytest.raises(RuntimeError, match="closed during the read"):
+            get_bytes(2)
+        assert len(_FakeSerial.opened) == 1
+        assert not _FakeSerial.opened[0].is_open and core._cached_serial is None
+
+    def test_close_wakes_read_and_reader_closes(self, monkeypatch):
+        """Test that close() cancels a blocked read; the reader closes the port."""
+
+        def blocking_read(self, n):
+            assert self.cancelled.wait(5)
+            return b""
+
+        monkeypatch.setattr(_FakeSerial, "read", blocking_read)
+        errors = []
+
+        def reader():
+            try:
+                get_bytes(4)
+            except RuntimeError as e:
+                errors.append(e)
+
+        worker = threading.Thread(target=reader)
+        worker.start()
+        deadline = time.monotonic() + 5
+        while core._active_reads == 0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        close()
+        worker.join(5)
+
+        assert not worker.is_alive()
+        assert len(errors) == 1 and "closed during the read" in str(errors[0])
+        ser = _FakeSerial.opened[0]
+        assert len(_FakeSerial.opened) == 1 and not ser.is_open
+        assert ser.closed_by is worker
+
+
+class TestPortCache:
+    """Test the port scan TTL cache (no hardware required)."""
+
+    @pytest.fixture(autouse=True)
+    def fake_ports(self, monkeypatch):
+        self.scans = 0
+        self.ports = [("/dev/ttyS0", "n/a"), ("/dev/ttyACM0", "TrueRNG")]
+
+        def comports():
+            self.scans += 1
+            return iter(self.ports)
+
+        monkeypatch.setattr(core.list_ports, "comports", comports)
+        core._drop_serial()
+        yield
+        core._drop_serial()
+
+    def test_scan_reused_within_ttl(self, monkeypatch):
+        """Test that polls within the TTL share one scan, then rescan."""
+        assert is_device_available() and is_device_available()
+        assert core._find_port() == "/dev/ttyACM0"
+        assert self.scans == 1
+        clock = core.time.monotonic() + core._PORT_TTL
+        monkeypatch.setattr(core.time, "monotonic", lambda: clock)
+        self.ports = []
+        assert not is_device_available()
+        assert self.scans == 2
+
+    def test_drop_serial_invalidates(self):
+        """Test that dropping the handle forces the next lookup to rescan."""
+        is_device_available()
+        core._drop_serial()
+        is_device_available()
+        assert self.scans == 2
+
+
+@pytest.mark.skipif(os.name != "posix", reason="termios is posix-only")
+class TestResetTtyMin:
+    """Test the in-process `stty min 1` replacement on a pseudo-terminal."""
+
+    def test_sets_vmin(self):
+        """Test that VMIN is set to 1 on the handle's tty."""
+        import pty
+        import termios
+        import tty
+
+        master, slave = pty.openpty()
+        try:
+            tty.setraw(slave)  # pyserial opens ports in raw mode
+            attrs = termios.tcgetattr(slave)
+            attrs[6][termios.VMIN] = 0
+            termios.tcsetattr(slave, termios.TCSANOW, attrs)
+            core._reset_tty_min(type("_Tty", (), {"fileno": lambda self: slave})())
+            assert termios.tcgetattr(slave)[6][termios.VMIN] == 1
+        finally:
+            os.close(master)
+            os.close(slave)
+
+
+class TestRandomIntBatching:
+    """Test that random_int batches rejection candidates (no hardware required)."""
+
+    def test_one_read_per_batch(self, monkeypatch):
+        """Test that rejected candidates are drawn from a single device read."""
+        calls = []
+
+        def fake_get_bytes(n):
+            calls.append(n)
+            # All candidates but the last exceed the range and are rejected
+            return b"\xff\xff" * (n // 2 - 1) + b"\x01\x00"
+
+        monkeypatch.setattr(core, "get_bytes", fake_get_bytes)
+        assert random_int(0, 1000) == 256  # 10 bits, big-endian 0x0100
+        assert calls == [2 * core._RANDOM_INT_CANDIDATES]
+
+    def test_range_coverage(self, monkeypatch):
+        """Test that every value in the range is reachable."""
+        monkeypatch.setattr(core, "get_bytes", os.urandom)
+        assert {random_int(1, 7) for _ in range(300)} == set(range(1, 7))
+
+    def test_candidate_widths(self, monkeypatch):
+        """Test exact widths, the power-of-two fast path and the odd-width path."""
+        calls = []
+
+        def fake_get_bytes(n):
+            calls.append(n)
+            return bytes(range(1, n + 1))
+
+        monkeypatch.setattr(core, "get_bytes", fake_get_bytes)
+        # Power-of-two ranges read a single candidate: 8 bits fit one byte
+        assert random_int(0, 256) == 1
+        assert random_int(5, 5 + (1 << 20)) == 5 + (0x010203 & 0xFFFFF)
+        assert calls == [1, 3]
+        # 21-bit range: a batch of 3-byte candidates via int.from_bytes
+        assert random_int(0, 3 << 19) == 0x010203
+        assert calls[2:] == [3 * core._RANDOM_INT_CANDIDATES]